@@ -1,10 +1,22 @@
 import streamlit as st
+import streamlit.components.v1 as components
 import pandas as pd
-import gspread
-from google.oauth2.service_account import Credentials
 from datetime import datetime
-import re
-import json
+import os
+import time
+from gspread.exceptions import APIError
+from gspread.utils import rowcol_to_a1
+
+from comun.config import REFRESCO_KPIS, REFRESCO_TABLERO
+from comun import pipeline
+from comun.cliente import ALTA, cliente_sheets
+from comun.sheets import obtener_hoja, mostrar_frescura, leida_de_api
+from comun.escritura import cola_escritura
+from comun.metricas import medir, mostrar_diagnostico
+from comun.tendencias import iniciar_registro
+from comun.cronometros import html_cronometros, alto_cronometros
+from comun.tablero import mostrar_tablero
+from comun.semaforo import VERDE, AMARILLO, ROJO, contar_semaforo, etiquetas_kpi
 
 # ==============================
 # --- Configuración página ---
@@ -12,157 +24,48 @@ import json
 st.set_page_config(page_title="Surtimiento", layout="wide")
 st.subheader("Surtimiento")
 
+# "navegador": los relojes corren en el navegador y el servidor revisa la hoja
+# cada INTERVALO_CRONOMETROS segundos. "servidor": loop de 1 s como antes.
+MODO_CRONOMETROS = os.environ.get("PANTALLAS_CRONOMETROS", "navegador")
+INTERVALO_CRONOMETROS = int(os.environ.get("PANTALLAS_INTERVALO_CRONOMETROS", "15"))
+
 # ==============================
 # --- Conexión Google Sheets ---
 # ==============================
-try:
-    # Cloud
-    google_creds = st.secrets["google"]
-except Exception:
-    # Local
-    with open("secrets.json", "r", encoding="utf-8") as f:
-        google_creds = json.load(f)
-
-credenciales = Credentials.from_service_account_info(
-    google_creds,
-    scopes=["https://www.googleapis.com/auth/spreadsheets"]
-)
-gc = gspread.authorize(credenciales)
-sh = gc.open_by_key("1UTPaPqfVZ5Z6dmlz9OMPp4W1mMcot9_piz7Bctr5S-I")
-ws = sh.worksheet("Logistica")
+ws = obtener_hoja("Logistica", escritura=True)
 
 # ==============================
-# --- Cargar datos ---
+# --- KPIs ---
 # ==============================
-data = ws.get_all_values()
-headers = data[0]
-data_recortada = data[1:]
-df = pd.DataFrame(data_recortada, columns=[c.strip() for c in headers])
+@st.fragment(run_every=REFRESCO_KPIS)
+def kpis():
+    df = pipeline.tablero("surtimiento")
+    mostrar_frescura("Logistica")
 
-# ==============================
-# --- Limpieza ---
-# ==============================
-if 'Remision' in df.columns:
-    df = df[df['Remision'].notna() & (df['Remision'].str.strip() != "")]
-    df['Remision'] = df['Remision'].astype(str).str.strip()
-    df['Remision'] = df['Remision'].apply(lambda x: re.sub(r'[^\x20-\x7E]+', '', x))
+    total = len(df)
+    conteo = contar_semaforo(df['Semaforo'])
+    etiqueta_verde, etiqueta_amarillo, etiqueta_rojo = etiquetas_kpi("surtimiento")
 
-# ==============================
-# --- Validación de fechas ---
-# ==============================
-def es_fecha_valida(valor):
-    if not valor or str(valor).strip() == "":
-        return False
-    valor = str(valor).strip()
-    try:
-        datetime.strptime(valor, "%d/%m/%Y")
-        return True
-    except ValueError:
-        pass
-    try:
-        partes = [p.strip() for p in valor.split("-")]
-        if len(partes) == 2:
-            datetime.strptime(partes[0], "%d/%m/%Y")
-            datetime.strptime(partes[1], "%d/%m/%Y")
-            return True
-    except ValueError:
-        pass
-    return False
-
-if 'Factura' in df.columns and 'Fecha fact' in df.columns:
-    condiciones = ((df['Factura'].isna()) | (df['Factura'].str.strip() == "") | (df['Factura'].str.upper() == "N/A")) & \
-                  (~df['Fecha fact'].apply(es_fecha_valida))
-
-    if 'Fecha entrega' in df.columns:
-        condiciones &= (df['Fecha entrega'].isna() | (df['Fecha entrega'].str.strip() == ""))
-    if 'Fecha de SURTIMIENTO' in df.columns:
-        condiciones &= (~df['Fecha de SURTIMIENTO'].apply(es_fecha_valida))
-
-    df = df[condiciones]
+    col1, col2, col3, col4 = st.columns(4)
+    col1.metric("📊 Total", total)
+    col2.metric(etiqueta_verde, conteo[VERDE])
+    col3.metric(etiqueta_amarillo, conteo[AMARILLO])
+    col4.metric(etiqueta_rojo, conteo[ROJO])
 
-# ==============================
-# --- Procesar columna Tiempo surtimiento y semáforo ---
-# ==============================
-if 'Tiempo surtimiento' in df.columns:
-    # Convertir a timedelta desde formato h:mm:ss
-    df['Tiempo surtimiento'] = pd.to_timedelta(df['Tiempo surtimiento'], errors='coerce')
-
-def semaforo_tiempo(x):
-    if pd.isnull(x):
-        return "⚪"
-    # Verde: hasta 2h40m
-    if x <= pd.Timedelta(hours=2, minutes=40):
-        return "🟢"
-    # Amarillo: hasta 3h
-    elif x <= pd.Timedelta(hours=3):
-        return "🟡"
-    # Rojo: más de 3h
-    else:
-        return "🔴"
-
-df['Semaforo'] = df['Tiempo surtimiento'].apply(semaforo_tiempo) if 'Tiempo surtimiento' in df.columns else "⚪"
 
 # ==============================
-# --- Ordenar por semáforo (rojo, amarillo, verde) ---
-# ==============================
-orden = {"🔴": 0, "🟡": 1, "🟢": 2, "⚪": 3}
-df['orden_semaforo'] = df['Semaforo'].map(orden)
-df = df.sort_values(by="orden_semaforo").reset_index(drop=True)
-
-# ==============================
-# --- KPIs ---
+# --- Tablero tipo grid ---
 # ==============================
-total = len(df)
-verde_count = (df['Semaforo'] == "🟢").sum()
-amarillo_count = (df['Semaforo'] == "🟡").sum()
-rojo_count = (df['Semaforo'] == "🔴").sum()
-
-col1, col2, col3, col4 = st.columns(4)
-col1.metric("📊 Total", total)
-col2.metric("🟢 Verde (≤2h40m)", verde_count)
-col3.metric("🟡 Amarillo (2h40–3h)", amarillo_count)
-col4.metric("🔴 Rojo (>3h)", rojo_count)
+@st.fragment(run_every=REFRESCO_TABLERO)
+def tablero():
+    mostrar_tablero(pipeline.tablero("surtimiento"), 'Remision', 'Semaforo')
 
 
+kpis()
 st.markdown("---")
-
-# ==============================
-# --- Tablero tipo grid ---
-# ==============================
-cuadros_por_fila = 22
-fila = []
-
-for i, row in df.iterrows():
-    color = (
-        "#d4edda" if row['Semaforo'] == "🟢" else
-        "#fff3cd" if row['Semaforo'] == "🟡" else
-        "#f8d7da" if row['Semaforo'] == "🔴" else "#e9ecef"
-    )
-
-    fila.append((row['Remision'], row['Semaforo'], color))
-
-    if len(fila) == cuadros_por_fila or i == df.index[-1]:
-        cols = st.columns(len(fila))
-        for c, (rem, sem, col_color) in zip(cols, fila):
-            c.markdown(
-                f"""
-                <div style="
-                    background-color:{col_color};
-                    border-radius:6px;
-                    padding:6px;
-                    text-align:center;
-                    margin:2px;
-                    color:black;
-                    font-size:12px;
-                    white-space:nowrap;
-                ">
-                    <strong>{rem}</strong><br>{sem}
-                </div>
-                """,
-                unsafe_allow_html=True
-            )
-        fila = []
-import time
+tablero()
+iniciar_registro()
+mostrar_diagnostico()
 
 # ==============================
 # --- Cronómetros por fila ---
@@ -174,18 +77,47 @@ col_inicio = 16  # HoraInicioP (P)
 col_pausa = 17   # HoraPausaP (Q)
 col_total = 18   # TiempoTotalP (R)
 
-placeholder = st.empty()  # para actualizar la tabla en vivo
+# Las escrituras de cada tick se agrupan y se envían en un solo batch_update
+cola = cola_escritura("Logistica")
+
+# Las escrituras van por número de fila: con Logistica servida de un snapshot
+# (quizá viejo, con filas movidas desde entonces) caerían en otras remisiones.
+# Se consulta antes de pedir el tablero: si la versión vigente viene de la
+# API, las siguientes también.
+ESPERA_API = "⏳ Esperando la primera lectura de Google Sheets para arrancar los cronómetros"
+
+
+def actualizar_cronometros(df):
+    """Lee P:R, detecta inicios y pausas automáticas y encola las escrituras.
+
+    Devuelve [(idx, remision, inicio, total)] con inicio None si el
+    cronómetro está detenido, o None si Sheets no respondió (cuota agotada).
+    """
+    if df.empty:
+        return []
+    # Leer P:R de todas las filas visibles en una sola llamada. Las pantallas
+    # de P1 que leen el mismo rango a la vez comparten la petición, y pasa
+    # antes que las lecturas de los tableros cuando la cuota está justa.
+    fila_min = int(df['fila_hoja'].min())
+    fila_max = int(df['fila_hoja'].max())
+    rango = f"{rowcol_to_a1(fila_min, col_inicio)}:{rowcol_to_a1(fila_max, col_total)}"
+    try:
+        with medir("p1.lectura_cronometros", filas=fila_max - fila_min + 1):
+            valores_cronometros = cliente_sheets().leer(ws.get, rango, clave=(ws.title, rango), prioridad=ALTA)
+    except APIError:
+        return None
+    estados = []
 
-# Loop de actualización en tiempo real (mientras la app esté abierta)
-while True:
     for idx, row in df.iterrows():
-        fila_hoja = idx + 2  # ajustar según encabezados de la hoja
-
-        # Leer valores actuales de la hoja (por fila)
-        valores = ws.row_values(fila_hoja)
-        inicio_str = valores[col_inicio-1] if len(valores) >= col_inicio else ""
-        pausa_str = valores[col_pausa-1] if len(valores) >= col_pausa else ""
-        total_str = valores[col_total-1] if len(valores) >= col_total else ""
+        fila_hoja = int(row['fila_hoja'])
+        pos = fila_hoja - fila_min
+        valores = valores_cronometros[pos] if pos < len(valores_cronometros) else []
+        valores = list(valores) + [""] * (3 - len(valores))  # la API recorta celdas vacías al final
+        inicio_str, pausa_str, total_str = valores[:3]
+        # Lo que sigue en la cola todavía no está en la hoja
+        inicio_str = cola.valor(fila_hoja, col_inicio, inicio_str)
+        pausa_str = cola.valor(fila_hoja, col_pausa, pausa_str)
+        total_str = cola.valor(fila_hoja, col_total, total_str)
 
         # Parsear valores
         inicio = datetime.strptime(inicio_str, "%d/%m/%Y %H:%M:%S") if inicio_str else None
@@ -195,24 +127,63 @@ while True:
         # Detectar inicio automático: si hay valor en A y no hay inicio
         if row['Remision'] and not inicio:
             inicio = datetime.now()
-            ws.update_cell(fila_hoja, col_inicio, inicio.strftime("%d/%m/%Y %H:%M:%S"))
-            ws.update_cell(fila_hoja, col_total, "0:00:00")
+            cola.encolar(fila_hoja, col_inicio, inicio.strftime("%d/%m/%Y %H:%M:%S"))
+            cola.encolar(fila_hoja, col_total, "0:00:00")
 
         # Detectar pausa automática: si hay valor en D y no estaba pausado
         if row['Fecha de SURTIMIENTO'] and not pausa:
             pausa = datetime.now()
             total += (pausa - inicio)
             inicio = None
-            ws.update_cell(fila_hoja, col_pausa, pausa.strftime("%d/%m/%Y %H:%M:%S"))
-            ws.update_cell(fila_hoja, col_total, str(total).split(".")[0])
-
-        # Calcular tiempo transcurrido
-        tiempo = total + ((datetime.now() - inicio) if inicio else pd.Timedelta(0))
-        df.at[idx, 'TiempoP'] = str(tiempo).split(".")[0]
+            cola.encolar(fila_hoja, col_pausa, pausa.strftime("%d/%m/%Y %H:%M:%S"))
+            cola.encolar(fila_hoja, col_total, str(total).split(".")[0])
 
-    # Mostrar cronómetros en Streamlit
-    with placeholder.container():
-        for _, row in df.iterrows():
-            st.write(f"{row['Remision']} — Tiempo: {row['TiempoP']}")
+        estados.append((idx, row['Remision'], inicio, total))
 
-    time.sleep(1)  # actualizar cada segundo
+    # Enviar las escrituras acumuladas (respeta el intervalo de la cola)
+    try:
+        cola.enviar()
+    except APIError:
+        pass  # siguen en la cola; se reintenta en el próximo tick
+
+    return estados
+
+
+if MODO_CRONOMETROS == "servidor":
+    with st.spinner(ESPERA_API):
+        while not leida_de_api("Logistica"):
+            time.sleep(1)
+    df = pipeline.tablero("surtimiento")
+    placeholder = st.empty()  # para actualizar la tabla en vivo
+
+    # Loop de actualización en tiempo real (mientras la app esté abierta)
+    while True:
+        for idx, rem, inicio, total in actualizar_cronometros(df) or []:
+            # Calcular tiempo transcurrido
+            tiempo = total + ((datetime.now() - inicio) if inicio else pd.Timedelta(0))
+            df.at[idx, 'TiempoP'] = str(tiempo).split(".")[0]
+
+        # Mostrar cronómetros en Streamlit
+        with placeholder.container():
+            for _, row in df.iterrows():
+                st.write(f"{row['Remision']} — Tiempo: {row['TiempoP']}")
+
+        time.sleep(1)  # actualizar cada segundo
+else:
+    # Los relojes avanzan en el navegador; el servidor sólo revisa la hoja
+    # cada INTERVALO_CRONOMETROS segundos y re-envía si algo cambió.
+    @st.fragment(run_every=INTERVALO_CRONOMETROS)
+    def cronometros_navegador():
+        if not leida_de_api("Logistica"):
+            st.caption(ESPERA_API)
+            return
+        actuales = actualizar_cronometros(pipeline.tablero("surtimiento"))
+        if actuales is None:
+            # Sin respuesta de Sheets: los relojes siguen con el último estado
+            actuales = st.session_state.get("estados_cronometros", [])
+            st.caption("⏸ Sin respuesta de Google Sheets; se reintenta en el próximo ciclo")
+        st.session_state.estados_cronometros = actuales
+        estados = [(rem, inicio, total) for _, rem, inicio, total in actuales]
+        components.html(html_cronometros(estados), height=alto_cronometros(len(estados)), scrolling=True)
+
+    cronometros_navegador()
@@ -0,0 +1,69 @@
+import time
+
+import pandas as pd
+import streamlit as st
+
+from comun.config import REFRESCO_KPIS
+from comun.metricas import mostrar_diagnostico
+from comun.pipeline import DIMENSIONES_TENDENCIAS
+from comun.tendencias import leer_tendencias
+
+# ==============================
+# --- Configuración página ---
+# ==============================
+# Esta página no llama a la API de Sheets: sólo lee el registro local de
+# tendencias que llenan las otras pantallas en cada sondeo.
+st.set_page_config(page_title="Tendencias", layout="wide")
+st.title("📈 Tendencias de Remisiones")
+
+PERIODOS = {"Último día": 1, "3 días": 3, "7 días": 7, "30 días": 30}
+DESGLOSES = {
+    "total": "Total",
+    "semaforo": "Semáforo",
+    "almacenista": "Almacenista",
+    "estatus": "Estatus operativo",
+    "servicio": "Tipo de servicio",
+}
+
+col1, col2, col3 = st.columns(3)
+periodo = col1.selectbox("Periodo", list(PERIODOS), index=1)
+tablero = col2.selectbox("Tablero", list(DIMENSIONES_TENDENCIAS), format_func=str.capitalize)
+desglose = col3.selectbox("Desglose", ["total", *DIMENSIONES_TENDENCIAS[tablero]], format_func=DESGLOSES.get)
+
+
+# ==============================
+# --- Serie por hora ---
+# ==============================
+def serie_por_hora(df, hasta):
+    """Conteo por valor al cierre de cada hora, hasta la hora de `hasta`.
+
+    Cada muestra trae todos los valores del momento (los que faltan valen 0)
+    y una hora sin muestras repite el último conteo conocido.
+    """
+    serie = df.pivot_table(index="tomado_en", columns="valor", values="conteo", aggfunc="sum").fillna(0)
+    horas = pd.date_range(serie.index.min().floor("h"), hasta.floor("h"), freq="h")
+    serie = serie.resample("h").last().reindex(horas).ffill()
+    if list(serie.columns) == [""]:
+        serie.columns = ["Total"]
+    return serie.astype(int)
+
+
+@st.fragment(run_every=REFRESCO_KPIS)
+def grafica():
+    df = leer_tendencias(tablero, desglose, time.time() - PERIODOS[periodo] * 24 * 3600)
+    if df.empty:
+        st.info("Todavía no hay muestras en este periodo. Se registran mientras alguna pantalla está abierta.")
+        return
+
+    serie = serie_por_hora(df, pd.Timestamp.now())
+    st.line_chart(serie)
+
+    # --- Cambio en el periodo por valor ---
+    cambio = pd.DataFrame({"Inicio": serie.iloc[0], "Ahora": serie.iloc[-1]})
+    cambio["Cambio"] = cambio["Ahora"] - cambio["Inicio"]
+    st.dataframe(cambio.sort_values("Ahora", ascending=False), use_container_width=True)
+    st.caption(f"Muestras: {df['tomado_en'].nunique()} · última {df['tomado_en'].max():%d/%m %H:%M}")
+
+
+grafica()
+mostrar_diagnostico()
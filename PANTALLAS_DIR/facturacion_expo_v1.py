@@ -1,89 +1,60 @@
 import streamlit as st
-import pandas as pd
-from datetime import datetime, timedelta
-import gspread
-from google.oauth2.service_account import Credentials
 import plotly.express as px
+import os
+import sys
 
-credenciales = Credentials.from_service_account_file(
-    "secrets.json",  
-    scopes=["https://www.googleapis.com/auth/spreadsheets.readonly"]
-)
-
-gc = gspread.authorize(credenciales)
-sh = gc.open_by_key("1UTPaPqfVZ5Z6dmlz9OMPp4W1mMcot9_piz7Bctr5S-I")
-worksheet = sh.worksheet("Logistica")
-
-data = worksheet.get_all_records()
-df = pd.DataFrame(data)
-
-df['Fecha fact'] = pd.to_datetime(df['Fecha fact'], errors='coerce')
+# Permite importar `comun` al correr la página desde PANTALLAS_DIR
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-def parse_hora(x):
-    try:
-        return pd.to_timedelta(x + ":00")
-    except:
-        return pd.NaT
+from comun.facturacion_expo import preparar_facturacion_expo
+from comun.pipeline import COLUMNAS_HOJAS
+from comun.semaforo import VERDE, AMARILLO, ROJO, contar_semaforo
+from comun.sheets import leer_versiones, mostrar_frescura
+from comun.tablero import mostrar_tabla
 
-df['Hora factura'] = df['Hora factura'].astype(str).apply(parse_hora)
-df['FechaHoraFact'] = df['Fecha fact'] + df['Hora factura'].fillna(pd.Timedelta(0))
+# La hoja llega del cliente compartido (comun.sheets): sondeo, cuota,
+# snapshots y PANTALLAS_BACKEND como en las demás pantallas
+@st.cache_resource(max_entries=1, show_spinner=False)
+def preparar(numero_version, _filas):
+    # Una vez por versión de Logistica, compartida por todas las sesiones
+    return preparar_facturacion_expo(_filas)
 
-df['Fecha de SURTIMIENTO'] = pd.to_datetime(df['Fecha de SURTIMIENTO'], errors='coerce')
-df['FechaHoraGuia'] = df['Fecha de SURTIMIENTO']
 
-def calcular_horas(row):
-    if pd.isnull(row['FechaHoraFact']) or pd.isnull(row['FechaHoraGuia']):
-        return None
-    return (row['FechaHoraFact'] - row['FechaHoraGuia']).total_seconds() / 3600
-
-df['HorasTranscurridas'] = df.apply(calcular_horas, axis=1)
-
-def semaforo(horas):
-    if pd.isnull(horas):
-        return "⚪"
-    elif horas < 3:
-        return "🟢"
-    elif horas < 4:
-        return "🟡"
-    else:
-        return "🔴"
-
-df['Semaforo'] = df['HorasTranscurridas'].apply(semaforo)
+version = leer_versiones(("Logistica",), {"Logistica": COLUMNAS_HOJAS["Logistica"]})["Logistica"]
+df = preparar(version.numero, version.filas)
 
 st.set_page_config(page_title="Dashboard de logística", layout="wide")
 st.title("📦 Dashboard de Pedidos Logística")
+mostrar_frescura("Logistica")
 
+conteo = contar_semaforo(df['Semaforo'])
 col1, col2, col3, col4 = st.columns(4)
 col1.metric("📊 Total Pedidos", len(df))
-col2.metric("🟢 Pedidos en Verde", (df['Semaforo'] == "🟢").sum())
-col3.metric("🟡 Pedidos en Amarillo", (df['Semaforo'] == "🟡").sum())
-col4.metric("🔴 Pedidos en Rojo", (df['Semaforo'] == "🔴").sum())
+col2.metric("🟢 Pedidos en Verde", conteo[VERDE])
+col3.metric("🟡 Pedidos en Amarillo", conteo[AMARILLO])
+col4.metric("🔴 Pedidos en Rojo", conteo[ROJO])
 
 st.markdown("---")
 
-def color_filas(row):
-    if row["Semaforo"] == "🟢":
-        return ["background-color: #d4edda"] * len(row)  # Verde claro
-    elif row["Semaforo"] == "🟡":
-        return ["background-color: #fff3cd"] * len(row)  # Amarillo claro
-    elif row["Semaforo"] == "🔴":
-        return ["background-color: #f8d7da"] * len(row)  # Rojo claro
-    else:
-        return [""] * len(row)
+# Fechas y horas legibles; el semáforo lo pone mostrar_tabla como primera columna
+COLUMNAS_TABLA = {
+    'FechaHoraGuia': st.column_config.DatetimeColumn(format="DD/MM/YYYY HH:mm"),
+    'FechaHoraFact': st.column_config.DatetimeColumn(format="DD/MM/YYYY HH:mm"),
+    'HorasTranscurridas': st.column_config.NumberColumn(format="%.1f h"),
+}
 
 st.subheader("📝 Tabla de Pedidos")
 df_tabla = df[['Pedido', 'Factura', 'Cliente', 'FechaHoraGuia', 'FechaHoraFact', 'HorasTranscurridas', 'Semaforo']]
 
-st.dataframe(
-    df_tabla.style.apply(color_filas, axis=1),
-    use_container_width=True
-)
+mostrar_tabla(df_tabla, column_config=COLUMNAS_TABLA)
 
 st.markdown("---")
 
 # --- Gráfico ---
 st.subheader("📊 Distribución por Semáforo")
-semaforo_count = df['Semaforo'].value_counts().reset_index()
+# El semáforo es categórico: value_counts también trae los colores en cero
+semaforo_count = df['Semaforo'].value_counts()
+semaforo_count = semaforo_count[semaforo_count > 0].reset_index()
 semaforo_count.columns = ["Semaforo", "Cantidad"]
 
 fig = px.bar(
@@ -110,4 +81,4 @@ filtro_cliente = st.text_input("Escribe el nombre del cliente:")
 
 if filtro_cliente:
     df_filtrado = df_tabla[df_tabla['Cliente'].str.contains(filtro_cliente, case=False, na=False)]
-    st.dataframe(df_filtrado, use_container_width=True)
\ No newline at end of file
+    mostrar_tabla(df_filtrado, column_config=COLUMNAS_TABLA)
\ No newline at end of file
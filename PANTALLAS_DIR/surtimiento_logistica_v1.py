@@ -1,50 +1,17 @@
 import streamlit as st
 import pandas as pd
-import gspread
-from google.oauth2.service_account import Credentials
 import plotly.express as px
-from datetime import timedelta
+from datetime import datetime, timedelta
+import os
+import sys
 
-# =============================
-# --- Autenticación Google Sheets ---
-# =============================
-credenciales = Credentials.from_service_account_file(
-    "secrets.json",
-    scopes=["https://www.googleapis.com/auth/spreadsheets.readonly"]
-)
-gc = gspread.authorize(credenciales)
-sh = gc.open_by_key("1UTPaPqfVZ5Z6dmlz9OMPp4W1mMcot9_piz7Bctr5S-I")
-worksheet = sh.worksheet("Surtimiento")
+# Permite importar `comun` al correr la página desde PANTALLAS_DIR
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-# =============================
-# --- Cargar datos ---
-# =============================
-data = worksheet.get_all_values()
+from comun.semaforo import VERDE, AMARILLO, ROJO, clasificar_semaforo, contar_semaforo
+from comun.sheets import leer_versiones, mostrar_frescura
+from comun.tablero import mostrar_tabla
 
-# =============================
-# --- Usar encabezados de la hoja ---
-# =============================
-headers = data[0]  # primera fila como headers
-data_recortada = data[1:]  # resto de filas
-df = pd.DataFrame(data_recortada, columns=headers)
-
-# =============================
-# --- Limpiar nombres de columnas ---
-# =============================
-df.columns = [c.strip() for c in df.columns]
-# =============================
-# --- Filtrar filas sin Remision ---
-# =============================
-if 'Remision' in df.columns:
-    df = df[df['Remision'].notna() & (df['Remision'].str.strip() != "")]
-
-# =============================
-# --- Conversión de columnas ---
-# =============================
-if 'Fecha de elab de la remision' in df.columns:
-    df['Fecha de elab de la remision'] = pd.to_datetime(df['Fecha de elab de la remision'], errors='coerce')
-if 'Fecha de entrega de la remision' in df.columns:
-    df['Fecha de entrega de la remision'] = pd.to_datetime(df['Fecha de entrega de la remision'], errors='coerce')
 
 # Parsear T. surtimiento como timedelta
 def parse_tiempo(x):
@@ -56,14 +23,9 @@ def parse_tiempo(x):
         return pd.NaT
 
 
-if 'T. surtimiento' in df.columns:
-    df['T. surtimiento'] = df['T. surtimiento'].apply(parse_tiempo)
-
 # =============================
 # --- Clasificación facturación vs surtimiento ---
 # =============================
-from datetime import datetime
-
 def estado_remision(row):
     fecha = str(row.get('Fecha de entrega de la remision', '')).strip()
     if not fecha:  # vacío
@@ -81,28 +43,6 @@ def estado_remision(row):
     return "Surtimiento"
 
 
-
-
-df['EstadoRemision'] = df.apply(estado_remision, axis=1)
-
-# =============================
-# --- Semáforo ---
-# =============================
-def semaforo(tiempo):
-    if pd.isnull(tiempo):
-        return "⚪"
-    if tiempo <= timedelta(hours=2, minutes=40):
-        return "🟢"
-    elif tiempo <= timedelta(hours=3):
-        return "🟡"
-    else:
-        return "🔴"
-
-if 'T. surtimiento' in df.columns:
-    df['Semaforo'] = df['T. surtimiento'].apply(semaforo)
-else:
-    df['Semaforo'] = "⚪"
-
 # =============================
 # --- Estado de Liberación ---
 # =============================
@@ -114,23 +54,65 @@ def estado_liberacion(x):
             return "Detenido"
     return "Pendiente"
 
-if 'Liberacion' in df.columns:
-    df['EstadoLogistica'] = df['Liberacion'].apply(estado_liberacion)
-else:
-    df['EstadoLogistica'] = "Pendiente"
+
+# =============================
+# --- Cargar datos ---
+# =============================
+# La hoja llega del cliente compartido (comun.sheets): sondeo, cuota,
+# snapshots y PANTALLAS_BACKEND como en las demás pantallas
+@st.cache_resource(max_entries=1, show_spinner=False)
+def preparar(numero_version, _filas):
+    # Una vez por versión de Surtimiento, compartida por todas las sesiones
+    # --- Usar encabezados de la hoja ---
+    headers = _filas[0]  # primera fila como headers
+    data_recortada = _filas[1:]  # resto de filas
+    df = pd.DataFrame(data_recortada, columns=headers)
+
+    # --- Limpiar nombres de columnas ---
+    df.columns = [c.strip() for c in df.columns]
+
+    # --- Filtrar filas sin Remision ---
+    if 'Remision' in df.columns:
+        df = df[df['Remision'].notna() & (df['Remision'].str.strip() != "")]
+
+    # --- Conversión de columnas ---
+    if 'Fecha de elab de la remision' in df.columns:
+        df['Fecha de elab de la remision'] = pd.to_datetime(df['Fecha de elab de la remision'], errors='coerce')
+    if 'Fecha de entrega de la remision' in df.columns:
+        df['Fecha de entrega de la remision'] = pd.to_datetime(df['Fecha de entrega de la remision'], errors='coerce')
+    if 'T. surtimiento' in df.columns:
+        df['T. surtimiento'] = df['T. surtimiento'].apply(parse_tiempo)
+
+    df['EstadoRemision'] = df.apply(estado_remision, axis=1)
+
+    # --- Semáforo ---
+    df['Semaforo'] = clasificar_semaforo(df, 'T. surtimiento', "surtimiento")
+
+    # --- Estado de Liberación ---
+    if 'Liberacion' in df.columns:
+        df['EstadoLogistica'] = df['Liberacion'].apply(estado_liberacion)
+    else:
+        df['EstadoLogistica'] = "Pendiente"
+    return df
+
+
+version = leer_versiones(("Surtimiento",))["Surtimiento"]
+df = preparar(version.numero, version.filas)
 
 # =============================
 # --- Dashboard ---
 # =============================
 st.set_page_config(page_title="Remisiones en surtimiento", layout="wide")
 st.title("📦 Remisiones en surtimiento")
+mostrar_frescura("Surtimiento")
 
 # --- Métricas principales ---
+conteo = contar_semaforo(df['Semaforo'])
 col1, col2, col3, col4 = st.columns(4)
 col1.metric("📊 Total Remisiones", len(df))
-col2.metric("🟢 En Verde", (df['Semaforo'] == "🟢").sum())
-col3.metric("🟡 En Amarillo", (df['Semaforo'] == "🟡").sum())
-col4.metric("🔴 En Rojo", (df['Semaforo'] == "🔴").sum())
+col2.metric("🟢 En Verde", conteo[VERDE])
+col3.metric("🟡 En Amarillo", conteo[AMARILLO])
+col4.metric("🔴 En Rojo", conteo[ROJO])
 
 # --- Métricas extra ---
 col5, col6, col7 = st.columns(3)
@@ -147,15 +129,11 @@ st.markdown("---")
 # =============================
 # --- Tablas separadas ---
 # =============================
-def color_filas(row):
-    if row["Semaforo"] == "🟢":
-        return ["background-color: #d4edda"] * len(row)
-    elif row["Semaforo"] == "🟡":
-        return ["background-color: #fff3cd"] * len(row)
-    elif row["Semaforo"] == "🔴":
-        return ["background-color: #f8d7da"] * len(row)
-    else:
-        return [""] * len(row)
+# El semáforo lo pone mostrar_tabla como primera columna fija
+COLUMNAS_TABLA = {
+    'Fecha de elab de la remision': st.column_config.DatetimeColumn(format="DD/MM/YYYY"),
+    'Fecha de entrega de la remision': st.column_config.DatetimeColumn(format="DD/MM/YYYY"),
+}
 
 st.subheader("📝 Remisiones en Surtimiento")
 cols_surt = ['Remision', 'Cliente', 'Nombre', 'Pedido', 'Fecha de elab de la remision',
@@ -163,7 +141,7 @@ cols_surt = ['Remision', 'Cliente', 'Nombre', 'Pedido', 'Fecha de elab de la rem
              'Almacenista', 'Tipo Prod (de la remision)', 'Comentarios', 'Liberacion', 'Semaforo', 'EstadoLogistica']
 cols_surt = [c for c in cols_surt if c in df.columns]
 df_surt = df[df['EstadoRemision'] == "Surtimiento"]
-st.dataframe(df_surt[cols_surt].style.apply(color_filas, axis=1), use_container_width=True)
+mostrar_tabla(df_surt[cols_surt], column_config=COLUMNAS_TABLA)
 
 st.subheader("📑 Remisiones en Facturación")
 cols_fact = ['Remision', 'Cliente', 'Nombre', 'Pedido', 'Fecha de elab de la remision',
@@ -172,7 +150,7 @@ cols_fact = ['Remision', 'Cliente', 'Nombre', 'Pedido', 'Fecha de elab de la rem
              'Semaforo', 'EstadoLogistica']
 cols_fact = [c for c in cols_fact if c in df.columns]
 df_fact = df[df['EstadoRemision'] == "Facturación"]
-st.dataframe(df_fact[cols_fact].style.apply(color_filas, axis=1), use_container_width=True)
+mostrar_tabla(df_fact[cols_fact], column_config=COLUMNAS_TABLA)
 
 st.markdown("---")
 
@@ -180,7 +158,9 @@ st.markdown("---")
 # --- Gráficos ---
 # =============================
 st.subheader("📊 Distribución por Semáforo")
-semaforo_count = df['Semaforo'].value_counts().reset_index()
+# El semáforo es categórico: value_counts también trae los colores en cero
+semaforo_count = df['Semaforo'].value_counts()
+semaforo_count = semaforo_count[semaforo_count > 0].reset_index()
 semaforo_count.columns = ["Semaforo", "Cantidad"]
 
 fig1 = px.bar(
@@ -223,4 +203,4 @@ if filtro_cliente:
     df_filtrado = df[df[cliente_col] == filtro_cliente]
     cols_filter = ['Remision', 'Nombre', 'Pedido', 'EstadoRemision', 'EstadoLogistica', 'T. surtimiento', 'Semaforo']
     cols_filter = [c for c in cols_filter if c in df.columns]
-    st.dataframe(df_filtrado[cols_filter], use_container_width=True)
+    mostrar_tabla(df_filtrado[cols_filter], column_config=COLUMNAS_TABLA)
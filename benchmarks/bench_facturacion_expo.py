@@ -0,0 +1,116 @@
+"""Compara la preparación de PANTALLAS_DIR/facturacion_expo_v1.py anterior
+(get_all_records, `.apply(parse_hora)` y `df.apply(calcular_horas, axis=1)`)
+contra `preparar_facturacion_expo` (get_all_values, columnas tipadas y resta
+por columnas).
+
+Las dos parten de la misma respuesta de `get_all_values()`; la anterior
+además pasa por `numericise_all` + `to_records`, como hace get_all_records.
+Todas las fechas tienen día > 12: la versión anterior no infiere el formato
+y cae a dateutil mes-primero, que lee "05/03/2025" como 3 de mayo. Con días
+sin ambigüedad las dos versiones deben dar el mismo resultado.
+
+Uso: python -m benchmarks.bench_facturacion_expo [--filas 10000 50000 100000] [--repeticiones 3]
+"""
+import argparse
+import random
+import time
+import warnings
+
+import numpy as np
+import pandas as pd
+from gspread.utils import numericise_all, to_records
+
+from comun.facturacion_expo import preparar_facturacion_expo
+from comun.semaforo import clasificar_semaforo
+
+ENCABEZADOS = ["Pedido", "Factura", "Cliente", "Fecha fact", "Hora factura",
+               "Fecha de SURTIMIENTO", "Paqueteria", "Destino", "Vendedor"]
+
+
+def generar_valores(n, semilla=0):
+    """Un año de facturas con la forma de get_all_values() (texto)."""
+    rnd = random.Random(semilla)
+    filas = [list(ENCABEZADOS)]
+    for i in range(n):
+        guia = pd.Timestamp(2025, rnd.randint(1, 12), rnd.randint(13, 27))
+        fact = guia + pd.Timedelta(days=rnd.choice([0, 0, 0, 1]))
+        x = rnd.random()
+        filas.append([
+            str(100000 + i),
+            f"F{200000 + i}" if x > 0.05 else "",
+            f"Cliente {rnd.randrange(400)}",
+            fact.strftime("%d/%m/%Y") if x > 0.08 else rnd.choice(["", "pendiente"]),
+            f"{rnd.randint(0, 23)}:{rnd.randint(0, 59):02d}" if x > 0.12 else rnd.choice(["", "N/A"]),
+            guia.strftime("%d/%m/%Y") if x < 0.95 else "",
+            rnd.choice(["", "DHL", "Estafeta", "Paquetexpress"]),
+            rnd.choice(["CDMX", "GDL", "MTY", "QRO", "PUE"]),
+            f"Vendedor {rnd.randrange(40)}",
+        ])
+    return filas
+
+
+def preparar_anterior(valores):
+    """La página antes del cambio, tal cual (sin Streamlit)."""
+    df = pd.DataFrame(to_records(valores[0], [numericise_all(f) for f in valores[1:]]))
+
+    df['Fecha fact'] = pd.to_datetime(df['Fecha fact'], errors='coerce')
+
+    def parse_hora(x):
+        try:
+            return pd.to_timedelta(x + ":00")
+        except:  # noqa: E722 (igual que la página)
+            return pd.NaT
+
+    df['Hora factura'] = df['Hora factura'].astype(str).apply(parse_hora)
+    df['FechaHoraFact'] = df['Fecha fact'] + df['Hora factura'].fillna(pd.Timedelta(0))
+
+    df['Fecha de SURTIMIENTO'] = pd.to_datetime(df['Fecha de SURTIMIENTO'], errors='coerce')
+    df['FechaHoraGuia'] = df['Fecha de SURTIMIENTO']
+
+    def calcular_horas(row):
+        if pd.isnull(row['FechaHoraFact']) or pd.isnull(row['FechaHoraGuia']):
+            return None
+        return (row['FechaHoraFact'] - row['FechaHoraGuia']).total_seconds() / 3600
+
+    df['HorasTranscurridas'] = df.apply(calcular_horas, axis=1)
+    df['Semaforo'] = clasificar_semaforo(df, 'HorasTranscurridas', "facturacion_expo")
+    return df
+
+
+def _mejor(funcion, repeticiones):
+    mejor, resultado = None, None
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        resultado = funcion()
+        dt = time.perf_counter() - t0
+        mejor = dt if mejor is None else min(mejor, dt)
+    return mejor, resultado
+
+
+def medir(n, repeticiones):
+    valores = generar_valores(n)
+    t_anterior, anterior = _mejor(lambda: preparar_anterior(valores), repeticiones)
+    t_nueva, nueva = _mejor(lambda: preparar_facturacion_expo(valores), repeticiones)
+
+    horas_a = pd.to_numeric(anterior['HorasTranscurridas'], errors='coerce').to_numpy(dtype=float)
+    horas_n = nueva['HorasTranscurridas'].to_numpy(dtype=float)
+    assert np.allclose(horas_a, horas_n, equal_nan=True), "HorasTranscurridas no coincide"
+    assert (anterior['Semaforo'].to_numpy() == nueva['Semaforo'].to_numpy()).all(), "Semaforo no coincide"
+    return t_anterior, t_nueva
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--filas", type=int, nargs="+", default=[10_000, 50_000, 100_000])
+    parser.add_argument("--repeticiones", type=int, default=3)
+    args = parser.parse_args()
+    # Avisos de inferencia de fechas de la versión anterior
+    warnings.simplefilter("ignore", UserWarning)
+
+    for n in args.filas:
+        t_anterior, t_nueva = medir(n, args.repeticiones)
+        print(f"{n:>7} filas  anterior: {t_anterior:.3f}s  columnas: {t_nueva:.3f}s  ({t_anterior / t_nueva:.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+"""Compara `fechas_validas` (vectorizada) contra el `.apply` fila por fila.
+
+Uso: python -m benchmarks.bench_fechas [filas]
+"""
+import random
+import sys
+import time
+
+import pandas as pd
+
+from comun.fechas import es_fecha_valida, fechas_validas
+
+
+def generar_fechas(n, semilla=0):
+    rnd = random.Random(semilla)
+    valores = []
+    for _ in range(n):
+        d, m, a = rnd.randint(1, 31), rnd.randint(1, 12), rnd.choice([2023, 2024, 2025])
+        tipo = rnd.random()
+        if tipo < 0.45:
+            valores.append(f"{d:02d}/{m:02d}/{a}")
+        elif tipo < 0.55:
+            valores.append(f"{d:02d}/{m:02d}/{a} - {rnd.randint(1, 28):02d}/{m:02d}/{a}")
+        elif tipo < 0.75:
+            valores.append("")
+        elif tipo < 0.80:
+            valores.append(rnd.choice(["N/A", "pendiente", "  ", "01/01/0001", "1/2/2024", "2024-01-05"]))
+        else:
+            valores.append(None)
+    return pd.Series(valores)
+
+
+def main(n):
+    serie = generar_fechas(n)
+
+    t0 = time.perf_counter()
+    esperado = serie.apply(es_fecha_valida)
+    t_apply = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    obtenido = fechas_validas(serie)
+    t_vector = time.perf_counter() - t0
+
+    assert obtenido.equals(esperado), "la versión vectorizada no coincide con es_fecha_valida"
+    print(f"{n} filas  apply: {t_apply:.3f}s  vectorizada: {t_vector:.3f}s  ({t_apply / t_vector:.1f}x)")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100_000)
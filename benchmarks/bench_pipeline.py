@@ -0,0 +1,173 @@
+"""Tiempo de cada etapa de los tableros (P1–P4) sobre datos sintéticos.
+
+Para cada tamaño genera las tres hojas con `benchmarks.datos_sinteticos` y
+mide, con el mejor de varias repeticiones: carga tipada, limpieza de
+remisiones, validación de fechas, filtro de cada tablero (el de
+facturación incluye el cruce con Ped Pendientes), semáforo, el índice de
+pedidos (completo e incremental), armado del HTML del tablero y los
+totales de P4. Los resultados se guardan en JSON para
+compararlos con una corrida anterior.
+
+Uso: python -m benchmarks.bench_pipeline [--filas 1000 10000 100000 500000]
+         [--repeticiones 3] [--guardar ETIQUETA] [--comparar ETIQUETA]
+"""
+import argparse
+import json
+import os
+import platform
+import time
+from datetime import datetime
+
+import pandas as pd
+
+from benchmarks.datos_sinteticos import generar_hojas
+from comun import pipeline
+from comun.fechas import a_fechas, fechas_validas
+from comun.indice_pedidos import EstatusFilas, IndicePedidos
+from comun.tablero import html_tablero
+
+CARPETA_RESULTADOS = os.path.join(os.path.dirname(__file__), "resultados")
+# Una etapa se marca como regresión si tarda más que esto veces la base
+TOLERANCIA = 1.25
+
+
+def _mejor(funcion, repeticiones):
+    mejor, resultado = None, None
+    for _ in range(repeticiones):
+        t0 = time.perf_counter()
+        resultado = funcion()
+        dt = time.perf_counter() - t0
+        mejor = dt if mejor is None else min(mejor, dt)
+    return mejor, resultado
+
+
+def medir(n, repeticiones):
+    """{etapa: segundos} para un tamaño de Logistica."""
+    hojas = generar_hojas(n)
+    tiempos = {}
+
+    def etapa(nombre, funcion):
+        tiempos[nombre], resultado = _mejor(funcion, repeticiones)
+        return resultado
+
+    # --- Carga y limpieza (compartidas) ---
+    crudo = etapa("carga_texto", lambda: pd.DataFrame(hojas["Logistica"][1:], columns=hojas["Logistica"][0]))
+    tipada = etapa("carga_tipada", lambda: pipeline.cargar_logistica(hojas["Logistica"]))
+    limpia = etapa("limpieza_remisiones", lambda: pipeline.limpiar_remisiones(tipada))
+    ped = etapa("carga_ped_pendientes", lambda: pipeline.tipar(hojas["Ped Pendientes"], pipeline.TIPOS_PED_PENDIENTES))
+
+    # --- Validación de fechas ---
+    etapa("fechas_validas_texto", lambda: fechas_validas(crudo["Fecha Entrega"]))
+    etapa("a_fechas", lambda: a_fechas(crudo["Fecha Entrega"]))
+
+    # --- P1 surtimiento ---
+    surt = etapa("p1_filtro", lambda: pipeline.filtrar_surtimiento(limpia))
+    surt = etapa("p1_semaforo", lambda: pipeline.clasificar(surt, 'Tiempo surtimiento', "surtimiento", 'Semaforo'))
+    etapa("p1_html", lambda: html_tablero(surt['Remision'], surt['Semaforo']))
+
+    # --- P2 embarques ---
+    emb = etapa("p2_filtro", lambda: pipeline.filtrar_embarques(limpia))
+    emb = etapa("p2_semaforo", lambda: pipeline.clasificar(emb, 'Tiempo de embarques', "embarques", 'Semaforo'))
+    etapa("p2_html", lambda: html_tablero(emb['Remision'], emb['Semaforo']))
+
+    # --- P3 facturación ---
+    fact = etapa("p3_cruce_filtro", lambda: pipeline.filtrar_facturacion(limpia, ped))
+    fact = etapa("p3_semaforo", lambda: pipeline.clasificar(fact, 'tiempo facturacion', "facturacion", 'semaforo'))
+    # Índice de pedidos: armado completo, y una actualización con 1 % de Ped
+    # Pendientes cambiado ya con las posiciones de Logistica armadas
+    etapa("p3_indice_completo", lambda: IndicePedidos(pipeline.ESTATUS_FACTURACION).actualizar(hojas["Ped Pendientes"]))
+    ediciones = []
+    for desfase in (1, 2):
+        editada = [list(f) for f in hojas["Ped Pendientes"]]
+        for fila in editada[desfase::100]:
+            fila[5] = "EMBARQUES" if fila[5] != "EMBARQUES" else "CERRADO"
+        ediciones.append(editada)
+
+    def incremental():
+        indice = IndicePedidos(pipeline.ESTATUS_FACTURACION)
+        indice.actualizar(hojas["Ped Pendientes"])
+        anotadas = EstatusFilas(limpia, pipeline._pedidos(limpia), indice.estatus)
+        anotadas.aplicar(indice.actualizar(ediciones[0]), indice.estatus)
+        t0 = time.perf_counter()
+        anotadas.aplicar(indice.actualizar(ediciones[1]), indice.estatus)
+        anotadas.serie()
+        return time.perf_counter() - t0
+    tiempos["p3_cruce_incremental"] = min(incremental() for _ in range(repeticiones))
+    completadas = pipeline.remisiones_completadas(hojas["remisiones_data"])
+    etapa("p3_html", lambda: html_tablero(fact['remision'], fact['semaforo'], fact['remision'].isin(completadas)))
+
+    # --- P4 globales: los tres totales desde la hoja ---
+    etapa("p4_totales", lambda: (
+        len(pipeline.filtrar_surtimiento(pipeline.limpiar_remisiones(pipeline.cargar_logistica(hojas["Logistica"])))),
+        len(pipeline.filtrar_embarques(limpia)),
+        len(pipeline.filtrar_facturacion(limpia, ped)),
+    ))
+
+    filas = {"surtimiento": len(surt), "embarques": len(emb), "facturacion": len(fact)}
+    return tiempos, filas
+
+
+def _ruta(etiqueta):
+    return os.path.join(CARPETA_RESULTADOS, f"{etiqueta}.json")
+
+
+def guardar(etiqueta, resultados):
+    os.makedirs(CARPETA_RESULTADOS, exist_ok=True)
+    with open(_ruta(etiqueta), "w", encoding="utf-8") as f:
+        json.dump(resultados, f, indent=2, ensure_ascii=False)
+
+
+def comparar(base, actual):
+    """Imprime la razón actual/base por etapa y devuelve las regresiones."""
+    regresiones = []
+    for n, medicion in actual["tamanos"].items():
+        anterior = base["tamanos"].get(n)
+        if anterior is None:
+            continue
+        print(f"\n{n} filas (actual / {base['etiqueta']})")
+        for etapa, segundos in medicion["tiempos"].items():
+            previo = anterior["tiempos"].get(etapa)
+            if not previo:
+                continue
+            razon = segundos / previo
+            marca = "  ← regresión" if razon > TOLERANCIA else ""
+            print(f"  {etapa:22s} {previo * 1000:9.1f} ms → {segundos * 1000:9.1f} ms  {razon:5.2f}x{marca}")
+            if marca:
+                regresiones.append((n, etapa, razon))
+    return regresiones
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--filas", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--repeticiones", type=int, default=3)
+    parser.add_argument("--guardar", metavar="ETIQUETA", help="guardar en benchmarks/resultados/ETIQUETA.json")
+    parser.add_argument("--comparar", metavar="ETIQUETA", help="comparar contra un resultado guardado")
+    args = parser.parse_args()
+
+    resultados = {
+        "etiqueta": args.guardar or "actual",
+        "fecha": datetime.now().isoformat(timespec="seconds"),
+        "python": platform.python_version(),
+        "pandas": pd.__version__,
+        "tamanos": {},
+    }
+    for n in args.filas:
+        tiempos, filas = medir(n, args.repeticiones)
+        resultados["tamanos"][str(n)] = {"tiempos": tiempos, "filas": filas}
+        print(f"\n{n} filas  (surtimiento {filas['surtimiento']}, embarques {filas['embarques']}, "
+              f"facturación {filas['facturacion']})")
+        for etapa, segundos in tiempos.items():
+            print(f"  {etapa:22s} {segundos * 1000:9.1f} ms")
+
+    if args.guardar:
+        guardar(args.guardar, resultados)
+    if args.comparar:
+        with open(_ruta(args.comparar), encoding="utf-8") as f:
+            regresiones = comparar(json.load(f), resultados)
+        if regresiones:
+            raise SystemExit(f"{len(regresiones)} etapas más lentas que la base (>{TOLERANCIA}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,82 @@
+"""Tamaño y tiempo de parseo de la respuesta de Sheets: hoja completa frente
+a sólo las columnas que usan los tableros (comun/proyeccion.py).
+
+Para cada tamaño pide los dos juegos de rangos a la hoja local (sin
+latencia ni cuota), serializa la respuesta como la enviaría la API y mide
+bytes, `json.loads` y el armado de filas.
+
+Uso: python -m benchmarks.bench_proyeccion [--filas 1000 10000 100000] [--repeticiones 3]
+"""
+import argparse
+import gc
+import json
+import time
+
+from gspread.utils import absolute_range_name, fill_gaps
+
+from benchmarks.datos_sinteticos import generar_hojas
+from comun.pipeline import COLUMNAS_HOJAS
+from comun.proyeccion import Proyeccion
+from comun.sheets_local import SpreadsheetLocal
+
+
+def _mejor(funcion, repeticiones):
+    # Sin recolector durante la medición, como timeit: los objetos grandes
+    # de la repetición anterior no deben cobrarse en la siguiente
+    mejor, resultado = None, None
+    gc.disable()
+    try:
+        for _ in range(repeticiones):
+            resultado = None
+            t0 = time.perf_counter()
+            resultado = funcion()
+            dt = time.perf_counter() - t0
+            mejor = dt if mejor is None else min(mejor, dt)
+    finally:
+        gc.enable()
+    return mejor, resultado
+
+
+def medir(n, repeticiones):
+    hojas = generar_hojas(n)
+    sh = SpreadsheetLocal(hojas, latencia=0, cuota_por_minuto=0)
+    resultados = {}
+    for nombre, columnas in COLUMNAS_HOJAS.items():
+        filas = hojas[nombre]
+        proyeccion = Proyeccion(nombre, columnas)
+        proyeccion.resolver(filas[0])
+
+        completa = json.dumps(sh.values_batch_get([absolute_range_name(nombre)]))
+        proyectada = json.dumps(sh.values_batch_get([proyeccion.rango_encabezados()] + proyeccion.rangos()))
+        t_completa, datos = _mejor(lambda: json.loads(completa), repeticiones)
+        t_armado_c, _ = _mejor(lambda: fill_gaps(datos["valueRanges"][0]["values"]), repeticiones)
+        t_proyectada, datos_p = _mejor(lambda: json.loads(proyectada), repeticiones)
+        t_armado_p, _ = _mejor(lambda: proyeccion.unir(datos_p["valueRanges"][1:]), repeticiones)
+        resultados[nombre] = {
+            "columnas": (len(proyeccion.encabezados_proyectados), len(filas[0])),
+            "bytes": (len(completa), len(proyectada)),
+            "json_loads": (t_completa, t_proyectada),
+            "armado": (t_armado_c, t_armado_p),
+        }
+    return resultados
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--filas", type=int, nargs="+", default=[1_000, 10_000, 100_000])
+    parser.add_argument("--repeticiones", type=int, default=3)
+    args = parser.parse_args()
+
+    for n in args.filas:
+        print(f"\n{n} filas")
+        for nombre, r in medir(n, args.repeticiones).items():
+            usadas, total = r["columnas"]
+            (b_c, b_p), (j_c, j_p), (a_c, a_p) = r["bytes"], r["json_loads"], r["armado"]
+            print(f"  {nombre:15s} {usadas}/{total} columnas")
+            print(f"    bytes        {b_c / 1024:10.0f} KiB → {b_p / 1024:8.0f} KiB  ({b_p / b_c:.0%})")
+            print(f"    json.loads   {j_c * 1000:10.1f} ms  → {j_p * 1000:8.1f} ms   ({j_p / j_c:.0%})")
+            print(f"    armado filas {a_c * 1000:10.1f} ms  → {a_p * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
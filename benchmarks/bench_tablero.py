@@ -0,0 +1,89 @@
+"""Tablero anterior (st.columns(22) + un st.markdown por tarjeta) contra el
+bloque único con CSS grid de comun.tablero.
+
+Corre ambos dentro de streamlit.testing (AppTest) y reporta tiempo del
+script, elementos generados y bytes de HTML enviados.
+
+Uso: python -m benchmarks.bench_tablero [remisiones]
+"""
+import sys
+import time
+
+from streamlit.testing.v1 import AppTest
+
+
+def tablero_anterior(n):
+    import random
+    import streamlit as st
+
+    rnd = random.Random(0)
+    semaforos = [rnd.choice(["🔴", "🟡", "🟢", "⚪"]) for _ in range(n)]
+    remisiones = [f"R{100000 + i}" for i in range(n)]
+
+    cuadros_por_fila = 22
+    fila = []
+    for i, (rem, sem) in enumerate(zip(remisiones, semaforos)):
+        color = (
+            "#d4edda" if sem == "🟢" else
+            "#fff3cd" if sem == "🟡" else
+            "#f8d7da" if sem == "🔴" else "#e9ecef"
+        )
+        fila.append((rem, sem, color))
+        if len(fila) == cuadros_por_fila or i == n - 1:
+            cols = st.columns(len(fila))
+            for c, (r, s, col_color) in zip(cols, fila):
+                c.markdown(
+                    f"""
+                    <div style="
+                        background-color:{col_color};
+                        border-radius:6px;
+                        padding:6px;
+                        text-align:center;
+                        margin:2px;
+                        color:black;
+                        font-size:12px;
+                        white-space:nowrap;
+                    ">
+                        <strong>{r}</strong><br>{s}
+                    </div>
+                    """,
+                    unsafe_allow_html=True
+                )
+            fila = []
+
+
+def tablero_grid(n):
+    import random
+    import pandas as pd
+    from comun.tablero import mostrar_tablero
+
+    rnd = random.Random(0)
+    df = pd.DataFrame({
+        "Remision": [f"R{100000 + i}" for i in range(n)],
+        "Semaforo": [rnd.choice(["🔴", "🟡", "🟢", "⚪"]) for _ in range(n)],
+    })
+    mostrar_tablero(df, "Remision", "Semaforo")
+
+
+def medir(funcion, n, repeticiones=3):
+    mejor = None
+    for _ in range(repeticiones):
+        at = AppTest.from_function(funcion, args=(n,), default_timeout=120)
+        t0 = time.perf_counter()
+        at.run()
+        dt = time.perf_counter() - t0
+        mejor = dt if mejor is None else min(mejor, dt)
+    markdowns = at.markdown
+    bytes_html = sum(len(m.value.encode("utf-8")) for m in markdowns)
+    return mejor, len(markdowns), len(at.columns), bytes_html
+
+
+def main(n):
+    for nombre, funcion in (("anterior", tablero_anterior), ("css grid", tablero_grid)):
+        segundos, n_markdown, n_columnas, bytes_html = medir(funcion, n)
+        print(f"{nombre:9s} {n} remisiones: {segundos * 1000:7.1f} ms  "
+              f"{n_markdown:4d} markdown  {n_columnas:4d} columnas  {bytes_html / 1024:7.1f} KiB")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 300)
@@ -0,0 +1,71 @@
+"""Prueba de carga sin red: N pantallas abiertas contra la hoja local.
+
+Genera datos sintéticos, los sirve con el backend local (latencia y cuota
+simuladas) y re-ejecuta las páginas como si hubiera N sesiones abiertas.
+Reporta llamadas a la "API" por minuto frente a lecturas servidas.
+
+Uso: python -m benchmarks.carga_local [--pantallas 10] [--segundos 60]
+         [--intervalo 5] [--filas 5000] [--latencia 0.3] [--cuota 60]
+"""
+import argparse
+import os
+import shutil
+import tempfile
+import time
+
+PAGINAS = ["P1_surtimiento.py", "P2_embarques.py", "P3_facturacion.py", "P4_globales.py"]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--pantallas", type=int, default=10)
+    parser.add_argument("--segundos", type=float, default=60)
+    parser.add_argument("--intervalo", type=float, default=5,
+                        help="segundos entre reruns de cada pantalla")
+    parser.add_argument("--filas", type=int, default=5_000)
+    parser.add_argument("--latencia", type=float, default=0.3)
+    parser.add_argument("--cuota", type=int, default=60)
+    args = parser.parse_args()
+
+    carpeta = tempfile.mkdtemp(prefix="pantallas_local_")
+    # El backend se elige al importar comun.sheets: configurar antes
+    os.environ.update({
+        "PANTALLAS_BACKEND": "local",
+        "PANTALLAS_LOCAL_DATOS": os.path.join(carpeta, "hojas"),
+        "PANTALLAS_LOCAL_LATENCIA": str(args.latencia),
+        "PANTALLAS_LOCAL_CUOTA": str(args.cuota),
+        "PANTALLAS_SNAPSHOTS_DIR": os.path.join(carpeta, "snapshots"),
+    })
+
+    from streamlit.testing.v1 import AppTest
+
+    from benchmarks.datos_sinteticos import escribir_csv, generar_hojas
+    from comun import sheets
+
+    escribir_csv(generar_hojas(args.filas), os.environ["PANTALLAS_LOCAL_DATOS"])
+    raiz = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    sesiones = [AppTest.from_file(os.path.join(raiz, PAGINAS[i % len(PAGINAS)]), default_timeout=120)
+                for i in range(args.pantallas)]
+
+    inicio = time.monotonic()
+    reruns = errores = 0
+    while time.monotonic() - inicio < args.segundos:
+        ronda = time.monotonic()
+        for at in sesiones:
+            at.run()
+            reruns += 1
+            errores += len(at.exception)
+        time.sleep(max(0.0, args.intervalo - (time.monotonic() - ronda)))
+
+    minutos = (time.monotonic() - inicio) / 60
+    api = sheets.estadisticas_api()
+    local = sheets.abrir_spreadsheet()
+    print(f"{args.pantallas} pantallas, {reruns} reruns en {minutos * 60:.0f} s ({errores} con excepción)")
+    print(f"lecturas servidas:    {api['lecturas_total']}")
+    print(f"llamadas de lectura:  {api['llamadas_total']} ({api['llamadas_total'] / minutos:.1f}/min)")
+    print(f"llamadas a la hoja:   {local.llamadas} (incluye escrituras), {local.rechazadas} rechazadas por cuota")
+    shutil.rmtree(carpeta, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,173 @@
+"""Tablas sintéticas con la forma de las hojas reales, como las devuelve
+`get_all_values()` (lista de filas de texto, encabezados en la primera).
+
+Uso: python -m benchmarks.datos_sinteticos [filas] [carpeta]
+     escribe Logistica.csv, Ped Pendientes.csv, remisiones_data.csv y
+     Surtimiento.csv
+"""
+import csv
+import os
+import random
+import sys
+
+ENCABEZADOS_LOGISTICA = [
+    "Remision", "no. pedido", "Cliente", "Almacenista", "Liberacion",
+    "Factura", "Fecha fact", "Fecha Entrega", "Fecha de SURTIMIENTO",
+    "T. Servicio", "Tiempo surtimiento", "Tiempo de embarques", "Tiempo facturacion",
+    "Observaciones", "Paqueteria",
+    # P, Q y R: columnas auxiliares de los cronómetros de P1
+    "HoraInicioP", "HoraPausaP", "TiempoTotalP",
+    "Guia", "Destino", "Vendedor",
+]
+ENCABEZADOS_PED_PENDIENTES = [
+    "no. pedido", "Cliente", "Fecha pedido", "Importe", "Moneda", "Estatus operativo",
+    "Vendedor", "Comentarios",
+]
+ENCABEZADOS_REMISIONES_DATA = ["Remision", "estado", "fecha"]
+# Hoja de PANTALLAS_DIR/surtimiento_logistica_v1.py
+ENCABEZADOS_SURTIMIENTO = [
+    "Remision", "Cliente", "Nombre", "Pedido", "Fecha de elab de la remision",
+    "Fecha de entrega de la remision", "Hora de la entrega de la remision", "T. surtimiento",
+    "Fecha Surtido", "Hora Surtido", "Almacenista", "Tipo Prod (de la remision)",
+    "Comentarios", "Liberacion",
+]
+
+ESTATUS = ["FACTURACION/FISICO EMBARQUES", "EMBARQUES", "SURTIMIENTO", "CREDITO", "CERRADO"]
+SERVICIOS = ["", "N/A", "LOCAL", "FORANEO", "PAQUETERIA"]
+# Caracteres que llegan pegados a la remisión desde otros sistemas
+BASURA = ["\u200b", "\u00a0", "\ufeff", "ñ", "\t"]
+
+
+def _fecha(rnd, vacia=0.4):
+    x = rnd.random()
+    if x < vacia:
+        return ""
+    d, m, a = rnd.randint(1, 28), rnd.randint(1, 12), rnd.choice([2024, 2025])
+    if x < vacia + 0.45:
+        return f"{d:02d}/{m:02d}/{a}"
+    if x < vacia + 0.52:
+        return f"{d:02d}/{m:02d}/{a} - {min(d + rnd.randint(1, 5), 28):02d}/{m:02d}/{a}"
+    return rnd.choice(["pendiente", "N/A", "1/2/2024", "2024-01-05", "31/02/2024"])
+
+
+def _duracion(rnd):
+    if rnd.random() < 0.08:
+        return ""
+    return f"{rnd.randint(0, 36)}:{rnd.randint(0, 59):02d}:{rnd.randint(0, 59):02d}"
+
+
+def _remision(rnd, i):
+    x = rnd.random()
+    if x < 0.03:
+        return rnd.choice(["", "  "])
+    remision = f"R{100000 + i}"
+    if x < 0.06:
+        remision = f" {remision}{rnd.choice(BASURA)}"
+    return remision
+
+
+def generar_logistica(n, semilla=0):
+    rnd = random.Random(semilla)
+    n_pedidos = max(n // 3, 1)
+    filas = [list(ENCABEZADOS_LOGISTICA)]
+    for i in range(n):
+        factura = rnd.choice(["", "", "N/A", f"F{200000 + i}"])
+        filas.append([
+            _remision(rnd, i),
+            f"P{rnd.randrange(n_pedidos)}",
+            f"Cliente {rnd.randrange(400)}",
+            f"Almacenista {rnd.randrange(30)}",
+            rnd.choice(["SI", "NO", ""]),
+            factura,
+            _fecha(rnd, vacia=0.6) if factura else "",
+            _fecha(rnd),
+            _fecha(rnd, vacia=0.5),
+            rnd.choice(SERVICIOS),
+            _duracion(rnd),
+            _duracion(rnd),
+            _duracion(rnd),
+            rnd.choice(["", "", "Urgente", "Cliente recoge", "Revisar dirección"]),
+            rnd.choice(["", "DHL", "Estafeta", "Paquetexpress"]),
+            "", "", "",
+            f"G{rnd.randrange(10 ** 9)}" if rnd.random() < 0.3 else "",
+            rnd.choice(["CDMX", "GDL", "MTY", "QRO", "PUE"]),
+            f"Vendedor {rnd.randrange(40)}",
+        ])
+    return filas
+
+
+def generar_ped_pendientes(n, semilla=0):
+    """Pedidos de `generar_logistica(n)` (un pedido por cada tres remisiones)."""
+    rnd = random.Random(semilla + 1)
+    filas = [list(ENCABEZADOS_PED_PENDIENTES)]
+    for p in range(max(n // 3, 1)):
+        filas.append([
+            f"P{p}",
+            f"Cliente {rnd.randrange(400)}",
+            _fecha(rnd, vacia=0),
+            f"{rnd.uniform(100, 500000):.2f}",
+            rnd.choice(["MXN", "USD"]),
+            rnd.choice(ESTATUS) + (" " if rnd.random() < 0.05 else ""),
+            f"Vendedor {rnd.randrange(40)}",
+            "",
+        ])
+    return filas
+
+
+def generar_remisiones_data(n, semilla=0):
+    rnd = random.Random(semilla + 2)
+    filas = [list(ENCABEZADOS_REMISIONES_DATA)]
+    for i in rnd.sample(range(n), k=min(n, max(n // 10, 1))):
+        filas.append([
+            f"R{100000 + i}",
+            rnd.choice(["completado", "Completado ", "pendiente"]),
+            _fecha(rnd, vacia=0),
+        ])
+    return filas
+
+
+def generar_surtimiento(n, semilla=0):
+    rnd = random.Random(semilla + 3)
+    filas = [list(ENCABEZADOS_SURTIMIENTO)]
+    for i in range(n):
+        cliente = rnd.randrange(400)
+        filas.append([
+            _remision(rnd, i),
+            f"C{cliente}",
+            f"Cliente {cliente}",
+            f"P{rnd.randrange(max(n // 3, 1))}",
+            _fecha(rnd, vacia=0),
+            _fecha(rnd, vacia=0.6),
+            f"{rnd.randint(7, 19)}:{rnd.randint(0, 59):02d}",
+            _duracion(rnd),
+            _fecha(rnd),
+            f"{rnd.randint(7, 19)}:{rnd.randint(0, 59):02d}" if rnd.random() < 0.6 else "",
+            f"Almacenista {rnd.randrange(30)}",
+            rnd.choice(["Refacciones", "Equipo", "Consumibles"]),
+            rnd.choice(["", "", "Urgente", "Incompleto"]),
+            rnd.choice(["Liberado", "Detenido", "", "liberado "]),
+        ])
+    return filas
+
+
+def generar_hojas(n, semilla=0):
+    """{nombre_hoja: filas} con las hojas que leen las pantallas."""
+    return {
+        "Logistica": generar_logistica(n, semilla),
+        "Ped Pendientes": generar_ped_pendientes(n, semilla),
+        "remisiones_data": generar_remisiones_data(n, semilla),
+        "Surtimiento": generar_surtimiento(n, semilla),
+    }
+
+
+def escribir_csv(hojas, carpeta):
+    os.makedirs(carpeta, exist_ok=True)
+    for nombre, filas in hojas.items():
+        with open(os.path.join(carpeta, f"{nombre}.csv"), "w", newline="", encoding="utf-8") as f:
+            csv.writer(f).writerows(filas)
+
+
+if __name__ == "__main__":
+    filas = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    carpeta = sys.argv[2] if len(sys.argv) > 2 else "datos_sinteticos"
+    escribir_csv(generar_hojas(filas), carpeta)
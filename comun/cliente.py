@@ -0,0 +1,184 @@
+import os
+import threading
+import time
+
+import streamlit as st
+from gspread.exceptions import APIError
+from tenacity import Retrying, retry_if_exception, stop_after_attempt, wait_random_exponential
+
+from comun.metricas import CUOTA_ESCRITURAS, CUOTA_LECTURAS, registrar
+
+# ==============================
+# --- Cliente de Sheets con cuota ---
+# ==============================
+# Todas las llamadas a la API pasan por un solo cliente del proceso que:
+#   - gasta de un presupuesto por minuto (cubeta de fichas) por debajo de la
+#     cuota de Google, separado para lecturas y escrituras como la cuota;
+#   - junta lecturas idénticas simultáneas en una sola petición;
+#   - reintenta 429 y 5xx con espera exponencial con variación aleatoria.
+# Con el presupuesto justo, las llamadas de prioridad ALTA (cronómetros de
+# P1) pasan primero y las NORMAL (tableros, sondeo) dejan una reserva.
+FRACCION_CUOTA = float(os.environ.get("PANTALLAS_FRACCION_CUOTA", "0.85"))
+# Parte del presupuesto que sólo pueden usar las llamadas de prioridad ALTA
+RESERVA_PRIORITARIA = float(os.environ.get("PANTALLAS_RESERVA_PRIORITARIA", "0.2"))
+INTENTOS_API = int(os.environ.get("PANTALLAS_INTENTOS_API", "5"))
+# Segundos máximos esperando presupuesto antes de rendirse con un 429 propio
+ESPERA_MAXIMA = float(os.environ.get("PANTALLAS_ESPERA_MAXIMA", "30"))
+
+ALTA = 0
+NORMAL = 1
+
+
+class PresupuestoAgotado(APIError):
+    """No hubo presupuesto en ESPERA_MAXIMA segundos. Se trata como un 429."""
+
+    def __init__(self, tipo):
+        mensaje = f"Presupuesto de {tipo} agotado"
+        Exception.__init__(self, mensaje)
+        self.code = 429
+        self.error = {"code": 429, "message": mensaje, "status": "RESOURCE_EXHAUSTED"}
+
+
+def es_error_reintentable(e):
+    # 429 = cuota por minuto agotada; 5xx = error temporal de Google.
+    # PresupuestoAgotado ya esperó ESPERA_MAXIMA: no se reintenta.
+    if isinstance(e, PresupuestoAgotado):
+        return False
+    return isinstance(e, APIError) and (e.code == 429 or e.code >= 500)
+
+
+class Presupuesto:
+    """Cubeta de fichas: `por_minuto` llamadas, repuestas de forma continua."""
+
+    def __init__(self, tipo, por_minuto, reserva=RESERVA_PRIORITARIA):
+        self.tipo = tipo
+        self.capacidad = max(1.0, float(por_minuto))
+        self.reserva = self.capacidad * reserva
+        self._fichas = self.capacidad
+        self._repuesto_en = time.monotonic()
+        self._esperando_alta = 0
+        self._condicion = threading.Condition()
+
+    def _reponer(self):
+        ahora = time.monotonic()
+        self._fichas = min(self.capacidad, self._fichas + (ahora - self._repuesto_en) * self.capacidad / 60)
+        self._repuesto_en = ahora
+
+    def _minimo(self, prioridad):
+        # NORMAL deja la reserva y además cede el turno a las ALTA en espera
+        if prioridad == ALTA:
+            return 1.0
+        return 1.0 + self.reserva if not self._esperando_alta else float("inf")
+
+    def tomar(self, prioridad=NORMAL, espera_maxima=ESPERA_MAXIMA):
+        """Consume una ficha, esperando lo necesario. Devuelve los segundos esperados."""
+        inicio = time.monotonic()
+        with self._condicion:
+            if prioridad == ALTA:
+                self._esperando_alta += 1
+            try:
+                while True:
+                    self._reponer()
+                    minimo = self._minimo(prioridad)
+                    if self._fichas >= minimo:
+                        self._fichas -= 1
+                        return time.monotonic() - inicio
+                    restante = espera_maxima - (time.monotonic() - inicio)
+                    if restante <= 0:
+                        raise PresupuestoAgotado(self.tipo)
+                    faltan = minimo - self._fichas if minimo != float("inf") else 1.0
+                    self._condicion.wait(min(restante, max(0.05, faltan * 60 / self.capacidad)))
+            finally:
+                if prioridad == ALTA:
+                    self._esperando_alta -= 1
+                    self._condicion.notify_all()
+
+    def agotar(self):
+        """Google respondió 429: nadie más gasta hasta que se repongan fichas."""
+        with self._condicion:
+            self._fichas = min(self._fichas, 0.0)
+            self._repuesto_en = time.monotonic()
+
+    def disponibles(self):
+        with self._condicion:
+            self._reponer()
+            return self._fichas
+
+
+class _EnVuelo:
+    def __init__(self):
+        self.listo = threading.Event()
+        self.resultado = None
+        self.error = None
+
+
+class ClienteSheets:
+    """Punto único de paso de las llamadas a la API de Sheets."""
+
+    def __init__(self, lecturas_por_minuto, escrituras_por_minuto, intentos=INTENTOS_API):
+        self.presupuestos = {
+            "lectura": Presupuesto("lectura", lecturas_por_minuto),
+            "escritura": Presupuesto("escritura", escrituras_por_minuto),
+        }
+        self.intentos = intentos
+        self._en_vuelo = {}
+        self._lock = threading.Lock()
+
+    def _llamar(self, tipo, prioridad, funcion, args, kwargs):
+        presupuesto = self.presupuestos[tipo]
+        reintentos = Retrying(
+            retry=retry_if_exception(es_error_reintentable),
+            wait=wait_random_exponential(multiplier=0.5, max=8),
+            stop=stop_after_attempt(self.intentos),
+            before_sleep=lambda estado: registrar(f"cliente.reintento_{tipo}", 0),
+            reraise=True,
+        )
+        for intento in reintentos:
+            with intento:
+                espera = presupuesto.tomar(prioridad)
+                if espera > 0.01:
+                    registrar(f"cliente.espera_{tipo}", espera)
+                try:
+                    return funcion(*args, **kwargs)
+                except APIError as e:
+                    if e.code == 429 and not isinstance(e, PresupuestoAgotado):
+                        presupuesto.agotar()
+                    raise
+
+    def leer(self, funcion, *args, clave=None, prioridad=NORMAL, **kwargs):
+        """Lectura con presupuesto y reintentos. Con `clave`, las lecturas
+        simultáneas con la misma clave comparten una sola petición (y el
+        mismo resultado: no modificarlo)."""
+        if clave is None:
+            return self._llamar("lectura", prioridad, funcion, args, kwargs)
+        with self._lock:
+            en_vuelo = self._en_vuelo.get(clave)
+            propia = en_vuelo is None
+            if propia:
+                en_vuelo = self._en_vuelo[clave] = _EnVuelo()
+        if not propia:
+            registrar("cliente.lecturas_juntadas", 0)
+            en_vuelo.listo.wait()
+            if en_vuelo.error is not None:
+                raise en_vuelo.error
+            return en_vuelo.resultado
+        try:
+            en_vuelo.resultado = self._llamar("lectura", prioridad, funcion, args, kwargs)
+            return en_vuelo.resultado
+        except Exception as e:
+            en_vuelo.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._en_vuelo[clave]
+            en_vuelo.listo.set()
+
+    def escribir(self, funcion, *args, prioridad=ALTA, **kwargs):
+        """Escritura con presupuesto y reintentos (nunca se juntan)."""
+        return self._llamar("escritura", prioridad, funcion, args, kwargs)
+
+
+@st.cache_resource(show_spinner=False)
+def cliente_sheets():
+    """Cliente compartido por todas las sesiones y el sondeo del proceso."""
+    return ClienteSheets(CUOTA_LECTURAS * FRACCION_CUOTA, CUOTA_ESCRITURAS * FRACCION_CUOTA)
@@ -0,0 +1,18 @@
+import os
+
+# ==============================
+# --- Refresco parcial de las páginas ---
+# ==============================
+# Cada sección de una página es un st.fragment que se vuelve a ejecutar sola
+# cada tantos segundos, leyendo de la caché compartida de hojas. El resto de
+# la página (configuración, títulos, conexión) no se vuelve a construir.
+REFRESCO_KPIS = int(os.environ.get("PANTALLAS_REFRESCO_KPIS", "30"))
+REFRESCO_TABLERO = int(os.environ.get("PANTALLAS_REFRESCO_TABLERO", "30"))
+
+# ==============================
+# --- Endpoint de métricas ---
+# ==============================
+# Interfaz donde escucha GET /metricas (comun/metricas.py). No tiene
+# autenticación: por defecto sólo responde en la propia máquina; "0.0.0.0"
+# lo expone a la red.
+METRICAS_HOST = os.environ.get("PANTALLAS_METRICAS_HOST", "127.0.0.1")
@@ -0,0 +1,61 @@
+import json
+
+# ==============================
+# --- Cronómetros en el navegador ---
+# ==============================
+# El servidor manda una sola vez el inicio (epoch) y el acumulado de cada
+# remisión; el navegador avanza los relojes cada segundo. El HTML no incluye
+# la hora actual, así que mientras los datos no cambien Streamlit no vuelve a
+# enviar ni a recargar el componente.
+
+_PLANTILLA = """
+<div id="cronometros" style="font-family:sans-serif; font-size:14px; line-height:1.6;"></div>
+<script>
+const datos = __DATOS__;
+const cont = document.getElementById("cronometros");
+const spans = datos.map(d => {
+    const linea = document.createElement("div");
+    const rem = document.createElement("span");
+    rem.textContent = d.r + " — Tiempo: ";
+    const t = document.createElement("span");
+    linea.appendChild(rem);
+    linea.appendChild(t);
+    cont.appendChild(linea);
+    return t;
+});
+function formato(seg) {
+    seg = Math.max(0, Math.floor(seg));
+    const h = Math.floor(seg / 3600);
+    const m = Math.floor((seg % 3600) / 60);
+    const s = seg % 60;
+    return h + ":" + String(m).padStart(2, "0") + ":" + String(s).padStart(2, "0");
+}
+function tick() {
+    const ahora = Date.now();
+    datos.forEach((d, i) => {
+        const corriendo = d.i === null ? 0 : (ahora - d.i) / 1000;
+        spans[i].textContent = formato(d.t + corriendo);
+    });
+}
+tick();
+setInterval(tick, 1000);
+</script>
+"""
+
+
+def html_cronometros(estados):
+    """HTML/JS autónomo para [(remision, inicio datetime o None, total timedelta)]."""
+    datos = [
+        {
+            "r": str(rem),
+            "i": int(inicio.timestamp() * 1000) if inicio else None,
+            "t": total.total_seconds(),
+        }
+        for rem, inicio, total in estados
+    ]
+    # Se inserta con textContent; sólo hay que evitar que "</" cierre el <script>
+    return _PLANTILLA.replace("__DATOS__", json.dumps(datos).replace("</", "<\\/"))
+
+
+def alto_cronometros(n_filas, maximo=600):
+    return min(maximo, 24 * max(n_filas, 1) + 16)
@@ -0,0 +1,211 @@
+import hashlib
+import os
+import threading
+
+from gspread.utils import absolute_range_name, rowcol_to_a1
+
+from comun.proyeccion import normalizar_encabezado
+
+# ==============================
+# --- Sincronización incremental ---
+# ==============================
+# Las filas de datos (sin encabezados) se agrupan en bloques de tamaño fijo.
+# En cada sincronización sólo se piden:
+#   - la fila de encabezados,
+#   - la columna clave (Remision) completa, para notar filas borradas o
+#     insertadas a mitad de hoja aunque el total de filas no cambie,
+#   - las filas nuevas debajo de la última conocida,
+#   - los últimos BLOQUES_CALIENTES bloques (donde viven las remisiones abiertas),
+#   - un bloque histórico en rotación, para detectar ediciones viejas.
+# Cada bloque recibido se compara por hash y sólo los que cambiaron se
+# reescriben en las filas. Con una proyección (comun/proyeccion.py) cada
+# tramo de filas se pide sólo en sus columnas. Si alguna fila se movió de
+# lugar se descarga la hoja completa: P1 escribe por número de fila.
+FILAS_POR_BLOQUE = int(os.environ.get("PANTALLAS_DELTA_FILAS_BLOQUE", "500"))
+BLOQUES_CALIENTES = int(os.environ.get("PANTALLAS_DELTA_BLOQUES_CALIENTES", "2"))
+# Cada cuántas sincronizaciones se descarga la hoja completa por seguridad
+SINCRONIZACIONES_POR_COMPLETA = int(os.environ.get("PANTALLAS_DELTA_COMPLETA_CADA", "60"))
+# Columna que identifica cada fila (si no está, la columna A)
+COLUMNA_CLAVE = "remision"
+
+
+def _hash_bloque(filas):
+    h = hashlib.blake2b(digest_size=16)
+    for fila in filas:
+        h.update("\x1f".join(fila).encode("utf-8"))
+        h.update(b"\x1e")
+    return h.digest()
+
+
+def _columna(ancho):
+    return rowcol_to_a1(1, max(ancho, 1)).rstrip("0123456789")
+
+
+def _rellenar(filas, ancho):
+    return [fila + [""] * (ancho - len(fila)) if len(fila) < ancho else fila for fila in filas]
+
+
+class SincronizadorDelta:
+    """Mantiene una copia de la hoja actualizada sólo con lo que cambió."""
+
+    def __init__(self, nombre_hoja, proyeccion=None):
+        self.nombre_hoja = nombre_hoja
+        self.proyeccion = proyeccion
+        self.filas = []        # filas[0] son los encabezados
+        self.hashes = []       # uno por bloque de filas de datos
+        self.sincronizaciones = 0
+        self._siguiente_frio = 0
+        self._plan = None
+        self.sembrado = False  # ¿filas de una descarga completa de la API?
+        self._lock = threading.Lock()
+
+    # ------------------------------
+    def iniciar(self, filas, sembrado=True):
+        """Carga completa: reinicia filas y hashes.
+
+        Con `sembrado=False` (filas de un snapshot en disco, quizá viejo) la
+        primera sincronización es una descarga completa.
+        """
+        with self._lock:
+            self.filas = filas
+            datos = self.filas[1:]
+            self.hashes = [_hash_bloque(datos[i:i + FILAS_POR_BLOQUE])
+                           for i in range(0, len(datos), FILAS_POR_BLOQUE)]
+            self.sembrado = sembrado
+            self.sincronizaciones = 1
+
+    @property
+    def n_datos(self):
+        return max(len(self.filas) - 1, 0)
+
+    @property
+    def ancho(self):
+        return len(self.filas[0]) if self.filas else 0
+
+    def _rangos_filas(self, fila_inicio, fila_fin=None):
+        if self.proyeccion is not None:
+            return self.proyeccion.rangos(fila_inicio, fila_fin)
+        col = _columna(self.ancho)
+        fin = f"{col}{fila_fin}" if fila_fin else col
+        return [absolute_range_name(self.nombre_hoja, f"A{fila_inicio}:{fin}")]
+
+    def _unir(self, grupo):
+        if self.proyeccion is not None:
+            return self.proyeccion.unir(grupo)
+        return grupo[0].get("values", [])
+
+    def _clave(self):
+        """(posición de la columna clave en las filas, su rango A1 en la hoja), o None."""
+        if self.proyeccion is not None:
+            en_hoja = [normalizar_encabezado(c) for c in self.proyeccion.encabezados]
+            indice = en_hoja.index(COLUMNA_CLAVE) if COLUMNA_CLAVE in en_hoja else 0
+            proyectadas = [i for inicio, fin in self.proyeccion.tramos for i in range(inicio, fin + 1)]
+            if indice not in proyectadas:
+                return None
+            posicion = proyectadas.index(indice)
+        else:
+            encabezados = [normalizar_encabezado(c) for c in self.filas[0]]
+            indice = posicion = encabezados.index(COLUMNA_CLAVE) if COLUMNA_CLAVE in encabezados else 0
+        letra = _columna(indice + 1)
+        return posicion, absolute_range_name(self.nombre_hoja, f"{letra}2:{letra}")
+
+    def _claves_iguales(self, filas, respuesta):
+        """¿Cada fila conocida sigue en su lugar según la columna clave?"""
+        posicion = self._clave()[0]
+        claves = [fila[0] if fila else "" for fila in respuesta.get("values", [])]
+        n = len(filas) - 1
+        # La API recorta las celdas vacías del final
+        claves += [""] * (n - len(claves))
+        return claves[:n] == [fila[posicion] for fila in filas[1:]]
+
+    def _encabezados_vigentes(self, encabezados):
+        if self.proyeccion is not None:
+            return self.proyeccion.vigente(encabezados) and self.proyeccion.encabezados_proyectados == self.filas[0]
+        return len(encabezados) <= self.ancho and _rellenar([encabezados], self.ancho)[0] == self.filas[0]
+
+    # ------------------------------
+    def rangos(self):
+        """Rangos A1 a pedir en esta sincronización, o None si toca descarga completa."""
+        if (not self.filas or not self.sembrado
+                or self.sincronizaciones % SINCRONIZACIONES_POR_COMPLETA == 0):
+            self._plan = None
+            return None
+        if self.proyeccion is not None and (not self.proyeccion.tramos
+                                            or self.proyeccion.encabezados_proyectados != self.filas[0]):
+            # Filas de otra proyección (p. ej. un snapshot anterior): descarga completa
+            self._plan = None
+            return None
+        clave = self._clave()
+        if clave is None:
+            # Sin columna clave no se pueden notar filas movidas
+            self._plan = None
+            return None
+        n_bloques = len(self.hashes)
+        calientes = list(range(max(n_bloques - BLOQUES_CALIENTES, 0), n_bloques))
+        frios = n_bloques - len(calientes)
+        bloques = list(calientes)
+        if frios:
+            bloques.insert(0, self._siguiente_frio % frios)
+            self._siguiente_frio = (self._siguiente_frio + 1) % frios
+        self._plan = bloques
+
+        rangos = [absolute_range_name(self.nombre_hoja, "1:1"), clave[1]]
+        rangos.extend(self._rangos_filas(self.n_datos + 2))
+        for b in bloques:
+            inicio = 2 + b * FILAS_POR_BLOQUE
+            rangos.extend(self._rangos_filas(inicio, inicio + FILAS_POR_BLOQUE - 1))
+        return rangos
+
+    def aplicar(self, value_ranges):
+        """Integra la respuesta de `rangos()`.
+
+        Devuelve (filas, cambió) o None si la hoja cambió de forma que exige
+        una descarga completa (columnas nuevas, filas borradas o insertadas).
+        """
+        bloques = self._plan
+        with self._lock:
+            ancho = self.ancho
+            encabezados = (value_ranges[0].get("values") or [[]])[0]
+            if not self._encabezados_vigentes(encabezados):
+                return None
+            if not self._claves_iguales(self.filas, value_ranges[1]):
+                # Filas borradas o insertadas: las posiciones ya no son confiables
+                return None
+            # Cada tramo de filas llega en uno o más rangos (uno por tramo de columnas)
+            k = len(self.proyeccion.tramos) if self.proyeccion is not None else 1
+            grupos = [value_ranges[i:i + k] for i in range(2, len(value_ranges), k)]
+            nuevas = _rellenar(self._unir(grupos[0]), ancho)
+
+            filas = list(self.filas)
+            hashes = list(self.hashes)
+            cambiados = []
+            for b, grupo in zip(bloques, grupos[1:]):
+                inicio = b * FILAS_POR_BLOQUE
+                esperadas = min(FILAS_POR_BLOQUE, self.n_datos - inicio)
+                # El último bloque puede traer también filas nuevas: ésas llegan aparte
+                bloque = _rellenar(self._unir(grupo)[:esperadas], ancho)
+                if len(bloque) < esperadas:
+                    # Filas borradas: las posiciones de los bloques ya no son confiables
+                    return None
+                h = _hash_bloque(bloque)
+                if h != hashes[b]:
+                    filas[1 + inicio:1 + inicio + esperadas] = bloque
+                    hashes[b] = h
+                    cambiados.append(b)
+
+            if nuevas:
+                ultimo = len(hashes) - 1
+                filas.extend(nuevas)
+                # El último bloque incompleto absorbe las primeras filas nuevas
+                desde = ultimo * FILAS_POR_BLOQUE if hashes else 0
+                datos = filas[1:]
+                hashes = hashes[:ultimo] if hashes else []
+                for i in range(desde, len(datos), FILAS_POR_BLOQUE):
+                    hashes.append(_hash_bloque(datos[i:i + FILAS_POR_BLOQUE]))
+
+            cambio = bool(cambiados or nuevas)
+            if cambio:
+                self.filas = filas
+                self.hashes = hashes
+            self.sincronizaciones += 1
+            return self.filas, cambio
@@ -0,0 +1,87 @@
+import os
+import threading
+import time
+
+import streamlit as st
+from gspread.exceptions import APIError
+from gspread.utils import ValueInputOption, rowcol_to_a1
+
+from comun.cliente import ALTA, cliente_sheets
+from comun.metricas import medir
+from comun.sheets import obtener_hoja
+
+# ==============================
+# --- Configuración ---
+# ==============================
+# Segundos mínimos entre dos envíos de la cola a Sheets
+INTERVALO_ESCRITURA = float(os.environ.get("PANTALLAS_INTERVALO_ESCRITURA", "5"))
+
+
+def _enviar(ws, datos, prioridad):
+    # Presupuesto de cuota y reintentos con espera: comun/cliente.py
+    cliente_sheets().escribir(ws.batch_update, datos, prioridad=prioridad,
+                              value_input_option=ValueInputOption.user_entered)
+
+
+# ==============================
+# --- Cola de escritura ---
+# ==============================
+class ColaEscritura:
+    """Agrupa las escrituras de celdas y las envía en un solo `batch_update`.
+
+    Si la misma celda se escribe varias veces antes del envío sólo viaja el
+    último valor. Mientras una escritura no se ha enviado, `valor()` la
+    devuelve para que la lectura siguiente no la pise.
+    """
+
+    def __init__(self, ws, intervalo=INTERVALO_ESCRITURA, prioridad=ALTA):
+        self.ws = ws
+        self.intervalo = intervalo
+        # Hoy sólo escriben los cronómetros de P1: pasan antes que las lecturas
+        self.prioridad = prioridad
+        self._pendientes = {}   # {(fila, columna): valor}
+        self._ultimo_envio = 0.0
+        self._lock = threading.Lock()
+
+    def encolar(self, fila, columna, valor):
+        with self._lock:
+            self._pendientes[(fila, columna)] = valor
+
+    def valor(self, fila, columna, leido):
+        """Valor pendiente de la celda, o el leído de la hoja si no hay."""
+        with self._lock:
+            return self._pendientes.get((fila, columna), leido)
+
+    def __len__(self):
+        with self._lock:
+            return len(self._pendientes)
+
+    def enviar(self, forzar=False):
+        """Envía lo pendiente si ya pasó el intervalo. Devuelve las celdas enviadas."""
+        with self._lock:
+            if not self._pendientes:
+                return 0
+            if not forzar and time.monotonic() - self._ultimo_envio < self.intervalo:
+                return 0
+            lote = self._pendientes
+            self._pendientes = {}
+            self._ultimo_envio = time.monotonic()
+
+        datos = [{"range": rowcol_to_a1(fila, columna), "values": [[valor]]}
+                 for (fila, columna), valor in lote.items()]
+        try:
+            with medir("sheets.escritura", filas=len(datos)):
+                _enviar(self.ws, datos, self.prioridad)
+        except APIError:
+            # Devolver a la cola sin pisar valores más nuevos encolados mientras tanto
+            with self._lock:
+                for celda, valor in lote.items():
+                    self._pendientes.setdefault(celda, valor)
+            raise
+        return len(datos)
+
+
+@st.cache_resource(show_spinner=False)
+def cola_escritura(nombre_hoja):
+    """Cola compartida por todas las sesiones que escriben en la hoja."""
+    return ColaEscritura(obtener_hoja(nombre_hoja, escritura=True))
@@ -0,0 +1,34 @@
+import pandas as pd
+
+from comun.fechas import fechas_representables
+from comun.pipeline import tipar
+from comun.semaforo import clasificar_semaforo
+
+# ==============================
+# --- Facturación expo ---
+# ==============================
+# Horas entre la guía (fecha de surtimiento) y la factura (fecha + hora) de
+# PANTALLAS_DIR/facturacion_expo_v1.py. Se arma directo de get_all_values():
+# cada columna se convierte una vez y la resta es por columnas, sin apply
+# por fila.
+TIPOS_FACTURACION_EXPO = {
+    'Pedido': "texto",
+    'Factura': "texto",
+    'Cliente': "texto",
+    'Fecha fact': "fecha",
+    'Hora factura': "hora",
+    'Fecha de SURTIMIENTO': "fecha",
+}
+
+
+def preparar_facturacion_expo(filas):
+    """Filas de Logistica (encabezados en la primera) → tabla con FechaHoraGuia,
+    FechaHoraFact, HorasTranscurridas y Semaforo."""
+    df = tipar(filas, TIPOS_FACTURACION_EXPO)
+    # Un año fuera de 1677-2262 no entra en la resta: sin dato, no horas absurdas
+    df['FechaHoraFact'] = fechas_representables(df['Fecha fact']) + df['Hora factura'].fillna(pd.Timedelta(0))
+    df['FechaHoraGuia'] = fechas_representables(df['Fecha de SURTIMIENTO'])
+    df['HorasTranscurridas'] = (df['FechaHoraFact'] - df['FechaHoraGuia']).dt.total_seconds() / 3600
+    # Verde: menos de 3h, Amarillo: menos de 4h, Rojo: 4h o más
+    df['Semaforo'] = clasificar_semaforo(df, 'HorasTranscurridas', "facturacion_expo")
+    return df
@@ -0,0 +1,112 @@
+from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+# ==============================
+# --- Validación de fechas ---
+# ==============================
+# Una fecha es válida si es "dd/mm/yyyy" o un rango "dd/mm/yyyy - dd/mm/yyyy".
+FORMATO_FECHA = "%d/%m/%Y"
+
+# Fecha válida que pandas no puede representar: se guarda como el día máximo
+# para que siga contando como válida en columnas datetime64
+FECHA_FUERA_DE_RANGO = pd.Timestamp.max.normalize()
+
+# Forma de una fecha que strptime aceptaría aunque pandas no pueda
+# representarla (años fuera de 1677-2262)
+_PATRON_FECHA = r"^(?:3[01]|[12]\d|0[1-9]|[1-9])/(?:1[0-2]|0[1-9]|[1-9])/\d{4}$"
+
+
+def es_fecha_valida(valor):
+    """Versión escalar, para valores sueltos."""
+    if not valor or str(valor).strip() == "":
+        return False
+    valor = str(valor).strip()
+    try:
+        datetime.strptime(valor, FORMATO_FECHA)
+        return True
+    except ValueError:
+        pass
+    try:
+        partes = [p.strip() for p in valor.split("-")]
+        if len(partes) == 2:
+            datetime.strptime(partes[0], FORMATO_FECHA)
+            datetime.strptime(partes[1], FORMATO_FECHA)
+            return True
+    except ValueError:
+        pass
+    return False
+
+
+def _fechas_validas(textos):
+    """Serie booleana: cada texto (ya sin espacios) es una fecha dd/mm/yyyy."""
+    validas = pd.to_datetime(textos, format=FORMATO_FECHA, errors="coerce").notna()
+    # Lo que pandas no pudo representar pero tiene forma de fecha se revisa uno a uno
+    rechazadas = textos[~validas]
+    dudosas = rechazadas[rechazadas.str.match(_PATRON_FECHA, na=False)]
+    if len(dudosas):
+        validas[dudosas.index] = dudosas.map(es_fecha_valida).to_numpy(dtype=bool)
+    return validas
+
+
+def _validar_unicos(unicos):
+    unicos = unicos.reset_index(drop=True)
+    simples = _fechas_validas(unicos)
+
+    partes = unicos.str.split("-")
+    dos_partes = (partes.str.len() == 2) & ~simples
+    rangos = pd.Series(False, index=unicos.index)
+    if dos_partes.any():
+        izquierda = partes[dos_partes].str[0].str.strip()
+        derecha = partes[dos_partes].str[1].str.strip()
+        rangos[dos_partes] = (_fechas_validas(izquierda) & _fechas_validas(derecha)).to_numpy(dtype=bool)
+
+    return (simples | rangos) & (unicos != "")
+
+
+def fechas_validas(serie):
+    """Versión vectorizada de `es_fecha_valida` para una columna completa.
+
+    Cada valor distinto se valida una sola vez y el resultado se reparte a
+    todas las filas; devuelve una Serie booleana con el mismo índice.
+    """
+    if len(serie) == 0:
+        return pd.Series(False, index=serie.index, dtype=bool)
+    if pd.api.types.is_datetime64_any_dtype(serie):
+        # Ya convertida con `a_fechas`: NaT es lo que no era fecha
+        return serie.notna()
+    textos = serie.where(serie.notna(), "").astype(str).str.strip()
+    unicos = pd.Series(textos.unique(), dtype=object)
+    validos = _validar_unicos(unicos)
+    return textos.map(dict(zip(unicos, validos))).astype(bool)
+
+
+def a_fechas(serie):
+    """Columna de texto a datetime64: cada fecha válida (un rango toma su fecha
+    inicial) o NaT. `fechas_validas` da el mismo resultado sobre cualquiera de
+    las dos formas."""
+    textos = serie.where(serie.notna(), "").astype(str).str.strip()
+    unicos = pd.Series(textos.unique(), dtype=object)
+    validos = _validar_unicos(unicos).to_numpy(dtype=bool)
+    inicio = unicos.str.split("-").str[0].str.strip()
+    fechas = pd.to_datetime(inicio, format=FORMATO_FECHA, errors="coerce").to_numpy()
+    fechas[validos & pd.isna(fechas)] = FECHA_FUERA_DE_RANGO.to_datetime64()
+    fechas[~validos] = np.datetime64("NaT")
+    posiciones = pd.Index(unicos).get_indexer(textos)
+    return pd.Series(fechas[posiciones], index=serie.index, name=serie.name)
+
+
+def fechas_representables(fechas):
+    """Fechas de `a_fechas` listas para hacer cuentas: FECHA_FUERA_DE_RANGO
+    (válida pero no representable) pasa a NaT."""
+    return fechas.mask(fechas == FECHA_FUERA_DE_RANGO)
+
+
+def a_horas(serie):
+    """Columna de horas "HH:MM" a timedelta64 (NaT si no es hora). Cada valor
+    distinto se convierte una sola vez."""
+    textos = serie.where(serie.notna(), "").astype(str).str.strip()
+    unicos = pd.Series(textos.unique(), dtype=object)
+    horas = pd.to_timedelta(unicos + ":00", errors="coerce").to_numpy()
+    return pd.Series(horas[pd.Index(unicos).get_indexer(textos)], index=serie.index, name=serie.name)
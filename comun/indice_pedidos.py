@@ -0,0 +1,134 @@
+import numpy as np
+import pandas as pd
+
+from comun.proyeccion import normalizar_encabezado
+
+# ==============================
+# --- Índice de pedidos ---
+# ==============================
+# El cruce de Logistica con Ped Pendientes ya no es un merge de las dos
+# tablas en cada versión: se mantiene {pedido: estatus} de los pedidos en
+# estatus de facturación y, aparte, el estatus de cada fila de Logistica.
+# Cuando sólo cambia Ped Pendientes se revisan las filas que cambiaron y se
+# corrigen únicamente las filas de Logistica de esos pedidos.
+FILAS_POR_COMPARACION = 1000
+
+
+class IndicePedidos:
+    """pedido → estatus operativo de Ped Pendientes, sólo estatus válidos.
+
+    Si un pedido aparece varias veces cuenta la primera fila con estatus
+    válido. `error` trae la columna que falta, si falta alguna.
+    """
+
+    def __init__(self, estatus_validos):
+        self.estatus_validos = set(estatus_validos)
+        self.filas = None
+        self.error = None
+        self.estatus = {}
+        self._filas_pedido = {}   # {pedido: [posición en filas, ...]}
+        self._columnas = None     # (columna de pedido, columna de estatus)
+
+    def _par(self, fila):
+        i, j = self._columnas
+        return (fila[i].strip() if i < len(fila) else "",
+                fila[j].strip() if j < len(fila) else "")
+
+    def _estatus_de(self, pedido):
+        for posicion in self._filas_pedido.get(pedido, ()):
+            estatus = self._par(self.filas[posicion])[1]
+            if estatus in self.estatus_validos:
+                return estatus
+        return None
+
+    def _reconstruir(self, filas):
+        self.filas = filas
+        self.estatus, self._filas_pedido, self._columnas = {}, {}, None
+        encabezados = [normalizar_encabezado(c) for c in filas[0]] if filas else []
+        for columna in ('estatus operativo', 'no. pedido'):
+            if columna not in encabezados:
+                self.error = f"No se encontró la columna '{columna}' en Ped Pendientes"
+                return
+        self.error = None
+        self._columnas = (encabezados.index('no. pedido'), encabezados.index('estatus operativo'))
+        for posicion in range(1, len(filas)):
+            pedido, estatus = self._par(filas[posicion])
+            self._filas_pedido.setdefault(pedido, []).append(posicion)
+            if estatus in self.estatus_validos and pedido not in self.estatus:
+                self.estatus[pedido] = estatus
+
+    def actualizar(self, filas):
+        """Lleva el índice a `filas`. Devuelve los pedidos cuyo estatus
+        cambió, o None si hubo que reconstruirlo entero."""
+        anteriores = self.filas
+        if (anteriores is None or self._columnas is None or not filas
+                or filas[0] != anteriores[0] or len(filas) < len(anteriores)):
+            # Primera vez, columnas distintas o filas borradas: las posiciones no sirven
+            self._reconstruir(filas)
+            return None
+
+        # Filas cambiadas en su lugar (por tramos, comparando listas en C) y agregadas al final
+        cambiadas = []
+        for inicio in range(1, len(anteriores), FILAS_POR_COMPARACION):
+            fin = min(inicio + FILAS_POR_COMPARACION, len(anteriores))
+            if filas[inicio:fin] != anteriores[inicio:fin]:
+                cambiadas.extend(i for i in range(inicio, fin) if filas[i] != anteriores[i])
+        cambiadas.extend(range(len(anteriores), len(filas)))
+
+        afectados = set()
+        for posicion in cambiadas:
+            if posicion < len(anteriores):
+                previo = self._par(anteriores[posicion])[0]
+                self._filas_pedido[previo].remove(posicion)
+                afectados.add(previo)
+            pedido = self._par(filas[posicion])[0]
+            posiciones = self._filas_pedido.setdefault(pedido, [])
+            posiciones.append(posicion)
+            posiciones.sort()
+            afectados.add(pedido)
+
+        self.filas = filas
+        cambiados = set()
+        for pedido in afectados:
+            estatus = self._estatus_de(pedido)
+            if estatus != self.estatus.get(pedido):
+                cambiados.add(pedido)
+                if estatus is None:
+                    del self.estatus[pedido]
+                else:
+                    self.estatus[pedido] = estatus
+            if not self._filas_pedido.get(pedido, True):
+                del self._filas_pedido[pedido]
+        return cambiados
+
+
+class EstatusFilas:
+    """Estatus de facturación de cada fila de un DataFrame de Logistica."""
+
+    def __init__(self, df_log, pedidos, estatus):
+        self.df_log = df_log
+        self._pedidos = pedidos
+        # Búsqueda vectorizada en el índice: una sola pasada por Logistica
+        self.valores = pedidos.map(estatus).to_numpy(dtype=object)
+        self._posiciones = None
+
+    def _armar_posiciones(self):
+        # Filas de cada pedido: códigos de factorize ordenados, un corte por código
+        codigos, unicos = pd.factorize(self._pedidos)
+        orden = np.argsort(codigos, kind="stable")
+        cortes = np.searchsorted(codigos[orden], np.arange(len(unicos) + 1))
+        self._posiciones = (orden, cortes, {p: i for i, p in enumerate(unicos)})
+
+    def aplicar(self, pedidos, estatus):
+        """Corrige sólo las filas de los pedidos que cambiaron en el índice."""
+        if self._posiciones is None:
+            # Se arma la primera vez que hace falta, no en cada versión de Logistica
+            self._armar_posiciones()
+        orden, cortes, codigo = self._posiciones
+        for pedido in pedidos:
+            c = codigo.get(pedido)
+            if c is not None:
+                self.valores[orden[cortes[c]:cortes[c + 1]]] = estatus.get(pedido, np.nan)
+
+    def serie(self):
+        return pd.Series(self.valores.copy(), index=self.df_log.index)
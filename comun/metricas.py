@@ -0,0 +1,174 @@
+import json
+import os
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from comun.config import METRICAS_HOST
+
+# ==============================
+# --- Métricas de operación ---
+# ==============================
+# Cada punto caliente (lecturas y escrituras a Sheets, etapas del pipeline,
+# armado del tablero) registra duración, filas y bytes en un registro del
+# proceso. Se consultan con ?diagnostico=1 en cualquier página o como JSON
+# en http://PANTALLAS_METRICAS_HOST:PANTALLAS_METRICAS_PUERTO/metricas.
+MUESTRAS_POR_METRICA = int(os.environ.get("PANTALLAS_METRICAS_MUESTRAS", "2000"))
+VENTANA_SEGUNDOS = int(os.environ.get("PANTALLAS_METRICAS_VENTANA", "300"))
+# 0 desactiva el endpoint
+PUERTO = int(os.environ.get("PANTALLAS_METRICAS_PUERTO", "9108"))
+# Límites por minuto de la API de Sheets para una cuenta de servicio
+CUOTA_LECTURAS = int(os.environ.get("PANTALLAS_CUOTA_LECTURAS", "60"))
+CUOTA_ESCRITURAS = int(os.environ.get("PANTALLAS_CUOTA_ESCRITURAS", "60"))
+
+
+@st.cache_resource(show_spinner=False)
+def _registro():
+    # {métrica: deque[(epoch, segundos, filas, bytes)]}
+    return {
+        "series": defaultdict(lambda: deque(maxlen=MUESTRAS_POR_METRICA)),
+        "inicio": time.time(),
+        "lock": threading.Lock(),
+    }
+
+
+def registrar(nombre, segundos, filas=0, bytes_=0):
+    registro = _registro()
+    with registro["lock"]:
+        registro["series"][nombre].append((time.time(), segundos, filas, bytes_))
+
+
+class Medicion:
+    """Lo que el bloque medido puede completar antes de cerrarse."""
+
+    def __init__(self, filas=0, bytes_=0):
+        self.filas = filas
+        self.bytes = bytes_
+
+
+@contextmanager
+def medir(nombre, filas=0):
+    """Registra la duración del bloque; `filas`/`bytes` se pueden fijar dentro."""
+    medicion = Medicion(filas)
+    inicio = time.perf_counter()
+    try:
+        yield medicion
+    finally:
+        registrar(nombre, time.perf_counter() - inicio, medicion.filas, medicion.bytes)
+
+
+def al_responder_api(respuesta, *args, **kwargs):
+    """Hook de `requests` para la sesión de gspread: cada petición HTTP real."""
+    tipo = "api.lectura" if respuesta.request.method == "GET" else "api.escritura"
+    registrar(tipo, respuesta.elapsed.total_seconds(), bytes_=len(respuesta.content))
+
+
+# ==============================
+# --- Resumen ---
+# ==============================
+def resumen(ventana=VENTANA_SEGUNDOS):
+    """{métrica: estadísticas} de las muestras de los últimos `ventana` segundos."""
+    registro = _registro()
+    ahora = time.time()
+    with registro["lock"]:
+        series = {nombre: list(muestras) for nombre, muestras in registro["series"].items()}
+
+    salida = {}
+    for nombre, muestras in sorted(series.items()):
+        recientes = np.array([m for m in muestras if m[0] >= ahora - ventana], dtype=float).reshape(-1, 4)
+        ultimo_minuto = recientes[recientes[:, 0] >= ahora - 60] if len(recientes) else recientes
+        duraciones = recientes[:, 1] * 1000 if len(recientes) else np.array([0.0])
+        salida[nombre] = {
+            "llamadas": int(len(recientes)),
+            "por_minuto": int(len(ultimo_minuto)),
+            "ms_p50": round(float(np.percentile(duraciones, 50)), 1),
+            "ms_p95": round(float(np.percentile(duraciones, 95)), 1),
+            "ms_max": round(float(duraciones.max()), 1),
+            "filas_ultima": int(muestras[-1][2]) if muestras else 0,
+            "bytes_por_minuto": int(ultimo_minuto[:, 3].sum()) if len(ultimo_minuto) else 0,
+        }
+    return salida
+
+
+def cuota(estadisticas=None):
+    """Uso de la cuota por minuto de Sheets: {tipo: (llamadas, límite)}."""
+    estadisticas = estadisticas if estadisticas is not None else resumen()
+    return {
+        "lecturas": (estadisticas.get("api.lectura", {}).get("por_minuto", 0), CUOTA_LECTURAS),
+        "escrituras": (estadisticas.get("api.escritura", {}).get("por_minuto", 0), CUOTA_ESCRITURAS),
+    }
+
+
+def metricas_json():
+    estadisticas = resumen()
+    return {
+        "generado": time.time(),
+        "proceso_desde": _registro()["inicio"],
+        "ventana_segundos": VENTANA_SEGUNDOS,
+        "cuota_por_minuto": {tipo: {"usadas": usadas, "limite": limite}
+                             for tipo, (usadas, limite) in cuota(estadisticas).items()},
+        "metricas": estadisticas,
+    }
+
+
+# ==============================
+# --- Endpoint JSON ---
+# ==============================
+class _Manejador(BaseHTTPRequestHandler):
+    def do_GET(self):
+        if self.path.rstrip("/") != "/metricas":
+            self.send_error(404)
+            return
+        cuerpo = json.dumps(metricas_json(), ensure_ascii=False).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(cuerpo)))
+        self.end_headers()
+        self.wfile.write(cuerpo)
+
+    def log_message(self, *args):
+        pass
+
+
+@st.cache_resource(show_spinner=False)
+def iniciar_endpoint(puerto=PUERTO, host=METRICAS_HOST):
+    """Servidor HTTP del proceso con GET /metricas. None si está desactivado
+    o el puerto ya está ocupado (otro proceso lo sirve)."""
+    if not puerto:
+        return None
+    try:
+        servidor = ThreadingHTTPServer((host, puerto), _Manejador)
+    except OSError:
+        return None
+    threading.Thread(target=servidor.serve_forever, name="metricas-http", daemon=True).start()
+    return servidor
+
+
+# ==============================
+# --- Panel de diagnóstico ---
+# ==============================
+def mostrar_diagnostico():
+    """Panel oculto: sólo aparece con ?diagnostico=1 en la URL."""
+    if st.query_params.get("diagnostico", "0") != "1":
+        return
+    estadisticas = resumen()
+    with st.expander("🔧 Diagnóstico", expanded=True):
+        columnas = st.columns(2)
+        for col, (tipo, (usadas, limite)) in zip(columnas, cuota(estadisticas).items()):
+            uso = usadas / limite if limite else 0.0
+            icono = "🔴" if uso >= 0.9 else "🟡" if uso >= 0.6 else "🟢"
+            col.progress(min(uso, 1.0), text=f"{icono} Cuota de {tipo}: {usadas}/{limite} por minuto")
+        if estadisticas:
+            tabla = pd.DataFrame.from_dict(estadisticas, orient="index")
+            tabla.index.name = "métrica"
+            st.dataframe(tabla, use_container_width=True)
+        servidor = iniciar_endpoint()
+        if servidor is not None:
+            st.caption(f"JSON: puerto {servidor.server_address[1]}, ruta /metricas · "
+                       f"ventana de {VENTANA_SEGUNDOS // 60} min")
@@ -0,0 +1,106 @@
+import os
+import threading
+import time
+from collections import deque
+
+import pandas as pd
+import streamlit as st
+
+from comun.snapshots import SNAPSHOTS_DIR
+
+# ==============================
+# --- Avisos de remisiones completadas ---
+# ==============================
+# Un solo rastreador por proceso compara las remisiones completadas de cada
+# versión de remisiones_data contra las ya vistas (diferencia de conjuntos
+# vectorizada) y genera un evento por cada una nueva. Cada sesión recuerda
+# hasta qué evento mostró: una pantalla nueva o recargada no repite el
+# historial. Las vistas se guardan en disco y se olvidan cuando llevan
+# VENTANA_NOTIFICACIONES segundos sin aparecer como completadas.
+VENTANA_NOTIFICACIONES = int(os.environ.get("PANTALLAS_VENTANA_NOTIFICACIONES", str(7 * 24 * 3600)))
+# Eventos recientes que se guardan para las sesiones que van atrasadas
+EVENTOS_EN_MEMORIA = int(os.environ.get("PANTALLAS_EVENTOS_EN_MEMORIA", "500"))
+RUTA_VISTAS = os.path.join(SNAPSHOTS_DIR, "notificadas.parquet")
+
+
+def _leer_vistas(ruta):
+    """{remisión: última vez vista completada} del disco, o None si no hay."""
+    try:
+        df = pd.read_parquet(ruta)
+        return pd.Series(df["visto_en"].to_numpy(dtype=float), index=pd.Index(df["remision"].astype(str)))
+    except (FileNotFoundError, OSError, ValueError, KeyError):
+        return None
+
+
+def _guardar_vistas(ruta, vistas):
+    os.makedirs(os.path.dirname(ruta) or ".", exist_ok=True)
+    temporal = f"{ruta}.{os.getpid()}.tmp"
+    pd.DataFrame({"remision": vistas.index.astype(str), "visto_en": vistas.to_numpy()}).to_parquet(temporal, index=False)
+    # Reemplazo atómico, igual que los snapshots
+    os.replace(temporal, ruta)
+
+
+class RastreadorCompletadas:
+    """Remisiones completadas ya anunciadas y eventos de las nuevas."""
+
+    def __init__(self, ruta=RUTA_VISTAS, ventana=VENTANA_NOTIFICACIONES, capacidad=EVENTOS_EN_MEMORIA):
+        self.ruta = ruta
+        self.ventana = ventana
+        vistas = _leer_vistas(ruta)
+        # Sin nada en disco, la primera versión es la línea base: no se anuncia el historial
+        self._linea_base = vistas is None
+        self.vistas = vistas if vistas is not None else pd.Series([], dtype=float, index=pd.Index([], dtype=object))
+        self.eventos = deque(maxlen=capacidad)   # (secuencia, remisión)
+        self.secuencia = 0
+        self._procesada = None
+        self._guardado_en = 0.0
+        self._lock = threading.Lock()
+
+    def actualizar(self, completadas, ahora=None):
+        """Integra las remisiones completadas de una versión (una vez por versión)."""
+        ahora = time.time() if ahora is None else ahora
+        with self._lock:
+            if completadas is self._procesada:
+                return
+            self._procesada = completadas
+            actuales = pd.Index(completadas.dropna().astype(str).unique())
+            nuevas = actuales.difference(self.vistas.index, sort=False)
+            if not self._linea_base:
+                for remision in nuevas:
+                    self.secuencia += 1
+                    self.eventos.append((self.secuencia, remision))
+            self._linea_base = False
+
+            # Última vez vista de cada una; se olvidan las que llevan una ventana sin aparecer
+            vistas = pd.concat([self.vistas[~self.vistas.index.isin(actuales)],
+                                pd.Series(ahora, index=actuales, dtype=float)])
+            vigentes = vistas >= ahora - self.ventana
+            olvidadas = int((~vigentes).sum())
+            self.vistas = vistas[vigentes]
+            if len(nuevas) or olvidadas or ahora - self._guardado_en >= self.ventana / 10:
+                _guardar_vistas(self.ruta, self.vistas)
+                self._guardado_en = ahora
+
+    def pendientes(self, cursor):
+        """(remisiones anunciadas después de `cursor`, cursor nuevo).
+
+        Sin cursor (sesión nueva) no hay pendientes: sólo se toma la posición.
+        """
+        with self._lock:
+            if cursor is None:
+                return [], self.secuencia
+            return [remision for secuencia, remision in self.eventos if secuencia > cursor], self.secuencia
+
+
+@st.cache_resource(show_spinner=False)
+def _rastreador():
+    return RastreadorCompletadas()
+
+
+def nuevas_completadas(completadas):
+    """Remisiones completadas que esta sesión todavía no ha anunciado."""
+    rastreador = _rastreador()
+    rastreador.actualizar(completadas)
+    nuevas, st.session_state.cursor_notificaciones = rastreador.pendientes(
+        st.session_state.get("cursor_notificaciones"))
+    return nuevas
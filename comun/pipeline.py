@@ -0,0 +1,345 @@
+import threading
+
+import pandas as pd
+import streamlit as st
+
+from comun.fechas import a_fechas, a_horas, fechas_validas
+from comun.indice_pedidos import EstatusFilas, IndicePedidos
+from comun.metricas import medir
+from comun.proyeccion import normalizar_encabezado
+from comun.semaforo import clasificar_semaforo
+from comun.sheets import leer_versiones
+
+# ==============================
+# --- Pipeline de tableros ---
+# ==============================
+# Etapas puras: cargar → limpiar remisiones → filtrar por tablero → clasificar.
+# Ninguna modifica su entrada. Cada resultado se guarda una vez por proceso
+# con la versión de las hojas de las que sale, así P1–P4 leen exactamente
+# lo mismo y sólo se recalcula cuando el sondeo publica una versión nueva.
+ESTATUS_FACTURACION = ["FACTURACION/FISICO EMBARQUES", "EMBARQUES"]
+
+# Columnas que usa algún tablero o las tendencias (Almacenista sólo la usan
+# éstas, DIMENSIONES_TENDENCIAS) y el tipo con que se cargan; las demás ni
+# se descargan (COLUMNAS_HOJAS). "Fecha entrega" y "Fecha de SURTIMIENTO" se
+# quedan como texto porque además de validarse se revisan vacías (P1 pausa
+# el cronómetro cuando la segunda trae cualquier valor).
+TIPOS_LOGISTICA = {
+    'Remision': "texto",
+    'no. pedido': "texto",
+    'Factura': "texto",
+    'Fecha fact': "fecha",
+    'Fecha Entrega': "fecha",
+    'Fecha entrega': "texto",
+    'Fecha de SURTIMIENTO': "texto",
+    'T. Servicio': "categoria",
+    'Almacenista': "categoria",
+    'Tiempo surtimiento': "duracion",
+    'Tiempo de embarques': "duracion",
+    'Tiempo facturacion': "duracion",
+}
+TIPOS_PED_PENDIENTES = {
+    'no. pedido': "texto",
+    'Estatus operativo': "categoria",
+}
+# Sólo estas columnas se piden a la API (comun/proyeccion.py). Logistica
+# incluye las de PANTALLAS_DIR/facturacion_expo_v1.py: la proyección de una
+# hoja es una sola por proceso.
+COLUMNAS_HOJAS = {
+    "Logistica": list(TIPOS_LOGISTICA) + ['Pedido', 'Cliente', 'Hora factura'],
+    "Ped Pendientes": list(TIPOS_PED_PENDIENTES),
+    "remisiones_data": ['Remision', 'estado'],
+}
+# Columnas por las que se cuentan las remisiones de cada tablero para las
+# tendencias (comun/tendencias.py, P5)
+DIMENSIONES_TENDENCIAS = {
+    "surtimiento": {"semaforo": 'Semaforo', "almacenista": 'Almacenista'},
+    "embarques": {"semaforo": 'Semaforo', "servicio": 'T. Servicio'},
+    "facturacion": {"semaforo": 'semaforo', "estatus": 'estatus operativo', "almacenista": 'almacenista'},
+}
+
+
+def _sin_factura(factura):
+    return factura.isna() | (factura.str.strip() == "") | (factura.str.upper() == "N/A")
+
+
+def normalizar_columnas(df):
+    # Normalizar nombres de columna: minúsculas, sin espacios, sin acentos
+    df = df.copy()
+    df.columns = [normalizar_encabezado(c) for c in df.columns]
+    return df
+
+
+_CONVERSIONES = {
+    "texto": lambda s: s.astype("string[pyarrow]"),
+    "categoria": lambda s: s.astype("category"),
+    "fecha": a_fechas,
+    "hora": a_horas,
+    "duracion": lambda s: pd.to_timedelta(s, errors='coerce'),
+}
+
+
+# ==============================
+# --- Etapas ---
+# ==============================
+def tipar(filas, tipos):
+    """DataFrame con sólo las columnas de `tipos`, convertidas una vez al cargar.
+
+    Se arma directo de las filas de la hoja (encabezados en la primera), sin
+    pasar por un DataFrame de texto con todas las columnas. El nombre se busca
+    tal cual y, si no está, sin distinguir mayúsculas.
+    """
+    if not filas:
+        return pd.DataFrame()
+    normalizados = {normalizar_encabezado(c): t for c, t in tipos.items()}
+    datos = filas[1:]
+    columnas = {}
+    for i, c in enumerate(c.strip() for c in filas[0]):
+        tipo = tipos.get(c, normalizados.get(normalizar_encabezado(c)))
+        if tipo is not None:
+            columnas[c] = _CONVERSIONES[tipo](pd.Series([fila[i] for fila in datos], dtype=object))
+    return pd.DataFrame(columnas, index=pd.RangeIndex(len(datos)))
+
+
+def cargar_logistica(filas):
+    """Logistica tipada con la fila real de la hoja (encabezados en la 1)."""
+    df = tipar(filas, TIPOS_LOGISTICA)
+    df['fila_hoja'] = (df.index + 2).astype("int32")
+    return df
+
+
+def limpiar_remisiones(df, col='Remision'):
+    if col not in df.columns:
+        return df
+    df = df[df[col].notna() & (df[col].str.strip() != "")].copy()
+    df[col] = df[col].str.strip().str.replace(r'[^\x20-\x7E]+', '', regex=True)
+    return df
+
+
+def filtrar_surtimiento(df):
+    """Remisiones sin factura, sin fecha de factura, sin entrega y sin surtir."""
+    if 'Factura' not in df.columns or 'Fecha fact' not in df.columns:
+        return df
+    condiciones = _sin_factura(df['Factura']) & ~fechas_validas(df['Fecha fact'])
+    if 'Fecha entrega' in df.columns:
+        condiciones &= (df['Fecha entrega'].isna() | (df['Fecha entrega'].str.strip() == ""))
+    if 'Fecha de SURTIMIENTO' in df.columns:
+        condiciones &= ~fechas_validas(df['Fecha de SURTIMIENTO'])
+    return df[condiciones]
+
+
+def filtrar_embarques(df):
+    """Remisiones con tipo de servicio y sin fecha de entrega."""
+    if 'Fecha Entrega' not in df.columns or 'T. Servicio' not in df.columns:
+        return df
+    return df[
+        ~fechas_validas(df['Fecha Entrega']) &
+        df['T. Servicio'].notna() &
+        (df['T. Servicio'].str.strip() != "") &
+        (df['T. Servicio'].str.upper() != "N/A")
+    ]
+
+
+def _columna(df, nombre):
+    """Columna de `df` que normalizada se llama `nombre`, o None."""
+    return next((c for c in df.columns if normalizar_encabezado(c) == nombre), None)
+
+
+def _vacio(df_log, error):
+    vacio = normalizar_columnas(df_log.iloc[0:0])
+    vacio.attrs["error"] = error
+    return vacio
+
+
+def _pedidos(df_log):
+    return df_log[_columna(df_log, 'no. pedido')].astype("string[pyarrow]").str.strip()
+
+
+def estatus_por_pedido(df_ped):
+    """{pedido: estatus operativo} de los pedidos en estatus de facturación.
+    Si un pedido se repite cuenta su primera fila válida."""
+    pedidos = df_ped[_columna(df_ped, 'no. pedido')].astype("string[pyarrow]").str.strip()
+    estatus = df_ped[_columna(df_ped, 'estatus operativo')].astype(str).str.strip()
+    validos = estatus.isin(ESTATUS_FACTURACION)
+    serie = pd.Series(estatus[validos].to_numpy(), index=pedidos[validos].to_numpy())
+    return serie[~serie.index.duplicated()].to_dict()
+
+
+def filtrar_facturacion(df_log, df_ped):
+    """Cruce con Ped Pendientes por estatus y remisiones sin facturar.
+
+    Cada fila de Logistica toma el estatus de su pedido por búsqueda en
+    {pedido: estatus}, sin merge. Si falta una columna necesaria devuelve un
+    DataFrame vacío con el motivo en `attrs["error"]`.
+    """
+    for df, hoja, columna in ((df_ped, "Ped Pendientes", 'estatus operativo'),
+                              (df_ped, "Ped Pendientes", 'no. pedido'),
+                              (df_log, "Logistica", 'no. pedido'),
+                              (df_log, "Logistica", 'remision')):
+        if _columna(df, columna) is None:
+            return _vacio(df_log, f"No se encontró la columna '{columna}' en {hoja}")
+    return filtrar_con_estatus(df_log, _pedidos(df_log).map(estatus_por_pedido(df_ped)))
+
+
+def filtrar_con_estatus(df_log, estatus):
+    """Filas de Logistica con estatus de facturación y sin facturar.
+
+    `estatus` va alineada con `df_log` (NaN si el pedido no aplica). El
+    resultado trabaja con columnas normalizadas (minúsculas).
+    """
+    con_estatus = estatus.notna()
+    df = normalizar_columnas(df_log[con_estatus])
+    df['no. pedido'] = df['no. pedido'].astype("string[pyarrow]").str.strip()
+    df['estatus operativo'] = estatus[con_estatus].astype(str).to_numpy()
+    df = limpiar_remisiones(df, 'remision')
+
+    factura = df.get('factura', pd.Series("", index=df.index))
+    df['factura'] = factura.astype("string[pyarrow]").str.strip().str.upper()
+    fecha_entrega = df.get('fecha entrega', pd.Series("", index=df.index))
+    return df[~fechas_validas(fecha_entrega) | (df['factura'] == "") | (df['factura'] == "N/A")]
+
+
+def remisiones_completadas(filas):
+    """Remisiones de remisiones_data con estado "completado" (vacía si faltan columnas)."""
+    encabezados = [normalizar_encabezado(c) for c in filas[0]] if filas else []
+    if 'remision' not in encabezados or 'estado' not in encabezados:
+        return pd.Series([], dtype="string[pyarrow]", name='remision')
+    i, j = encabezados.index('remision'), encabezados.index('estado')
+    datos = filas[1:]
+    remisiones = pd.Series([f[i] for f in datos], dtype="string[pyarrow]", name='remision')
+    estado = pd.Series([f[j] for f in datos], dtype="string[pyarrow]").str.strip().str.lower()
+    return remisiones[(estado == "completado").fillna(False)].reset_index(drop=True)
+
+
+def agregar(df, dimensiones):
+    """Conteos de `df` en formato largo (dimension, valor, conteo): el total y
+    uno por valor de cada columna de `dimensiones` que exista."""
+    partes = [pd.DataFrame({"dimension": ["total"], "valor": [""], "conteo": [len(df)]})]
+    for dimension, columna in dimensiones.items():
+        if columna in df.columns:
+            conteo = df[columna].astype("string").fillna("").str.strip().value_counts(sort=False)
+            partes.append(pd.DataFrame({"dimension": dimension, "valor": conteo.index.astype(str),
+                                        "conteo": conteo.to_numpy()}))
+    return pd.concat(partes, ignore_index=True)
+
+
+def clasificar(df, columna_tiempo, tablero, columna_semaforo):
+    """Convierte el tiempo a timedelta, agrega el semáforo y ordena (rojo primero)."""
+    df = df.copy()
+    if columna_tiempo in df.columns:
+        df[columna_tiempo] = pd.to_timedelta(df[columna_tiempo], errors='coerce')
+    df[columna_semaforo] = clasificar_semaforo(df, columna_tiempo, tablero)
+    return df.sort_values(by=columna_semaforo, kind="stable").reset_index(drop=True)
+
+
+# ==============================
+# --- Resultados por versión ---
+# ==============================
+@st.cache_resource(show_spinner=False)
+def _resultados():
+    # {etapa: (versiones de las hojas de entrada, DataFrame)}. El índice de
+    # pedidos y el estatus por fila de Logistica sobreviven entre versiones.
+    return {
+        "etapas": {}, "lock": threading.Lock(),
+        "indice_pedidos": IndicePedidos(ESTATUS_FACTURACION), "estatus_filas": None,
+        "lock_indice": threading.Lock(),
+    }
+
+
+def _por_version(etapa, hojas, calcular):
+    versiones = leer_versiones(hojas, {n: COLUMNAS_HOJAS[n] for n in hojas if n in COLUMNAS_HOJAS})
+    clave = tuple(versiones[n].numero for n in hojas)
+    cache = _resultados()
+    with cache["lock"]:
+        guardado = cache["etapas"].get(etapa)
+    if guardado is not None and guardado[0] == clave:
+        return guardado[1]
+    with medir(f"pipeline.{etapa}") as medicion:
+        resultado = calcular(*(versiones[n].filas for n in hojas))
+        medicion.filas = len(resultado)
+    with cache["lock"]:
+        cache["etapas"][etapa] = (clave, resultado)
+    return resultado
+
+
+def _logistica_limpia():
+    return _por_version("logistica_limpia", ("Logistica",),
+                        lambda filas: limpiar_remisiones(cargar_logistica(filas)))
+
+
+def _surtimiento():
+    return _por_version("surtimiento", ("Logistica",), lambda _: clasificar(
+        filtrar_surtimiento(_logistica_limpia()), 'Tiempo surtimiento', "surtimiento", 'Semaforo'))
+
+
+def _embarques():
+    return _por_version("embarques", ("Logistica",), lambda _: clasificar(
+        filtrar_embarques(_logistica_limpia()), 'Tiempo de embarques', "embarques", 'Semaforo'))
+
+
+def _facturacion_indexada(filas_ped):
+    """filtrar_facturacion con el índice de pedidos mantenido entre versiones:
+    si sólo cambió Ped Pendientes, sólo se tocan los pedidos que cambiaron."""
+    df_log = _logistica_limpia()
+    estado = _resultados()
+    with estado["lock_indice"]:
+        indice = estado["indice_pedidos"]
+        cambiados = indice.actualizar(filas_ped) if indice.filas is not filas_ped else set()
+        if indice.error:
+            return _vacio(df_log, indice.error)
+        for columna in ('no. pedido', 'remision'):
+            if _columna(df_log, columna) is None:
+                return _vacio(df_log, f"No se encontró la columna '{columna}' en Logistica")
+        anotadas = estado["estatus_filas"]
+        if anotadas is None or anotadas.df_log is not df_log or cambiados is None:
+            anotadas = estado["estatus_filas"] = EstatusFilas(df_log, _pedidos(df_log), indice.estatus)
+        elif cambiados:
+            anotadas.aplicar(cambiados, indice.estatus)
+        estatus = anotadas.serie()
+    return filtrar_con_estatus(df_log, estatus)
+
+
+def _facturacion():
+    return _por_version("facturacion", ("Logistica", "Ped Pendientes"), lambda _, filas_ped: clasificar(
+        _facturacion_indexada(filas_ped), 'tiempo facturacion', "facturacion", 'semaforo'))
+
+
+_TABLEROS = {
+    "surtimiento": _surtimiento,
+    "embarques": _embarques,
+    "facturacion": _facturacion,
+}
+
+
+def tablero(nombre):
+    """Resultado ya filtrado, clasificado y ordenado del tablero.
+
+    Cada llamada devuelve una copia: la página puede agregar columnas sin
+    afectar a las demás sesiones.
+    """
+    return _TABLEROS[nombre]().copy()
+
+
+def totales():
+    """{tablero: número de remisiones} sin copiar los resultados."""
+    return {nombre: len(calcular()) for nombre, calcular in _TABLEROS.items()}
+
+
+def agregados():
+    """Conteos de los tres tableros por dimensión (agregar) de la versión vigente.
+
+    Columnas: tablero, dimension, valor, conteo. Es el mismo objeto mientras
+    las hojas no cambien (no modificarlo).
+    """
+    return _por_version("agregados", ("Logistica", "Ped Pendientes"), lambda *_: pd.concat(
+        [agregar(calcular(), DIMENSIONES_TENDENCIAS[nombre]).assign(tablero=nombre)
+         for nombre, calcular in _TABLEROS.items()], ignore_index=True))
+
+
+def completadas():
+    """Remisiones completadas de la versión vigente de remisiones_data.
+
+    Es el mismo objeto mientras la hoja no cambie (no modificarlo): el
+    rastreador de avisos lo usa para procesar cada versión una sola vez.
+    """
+    return _por_version("completadas", ("remisiones_data",), remisiones_completadas)
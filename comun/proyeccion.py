@@ -0,0 +1,86 @@
+from gspread.utils import absolute_range_name, rowcol_to_a1
+
+# ==============================
+# --- Lectura por columnas ---
+# ==============================
+# Una hoja con proyección no se descarga completa: se ubican una vez en los
+# encabezados las columnas que usan los tableros, se agrupan en tramos
+# contiguos (A:C, F:M...) y sólo se piden esos rangos. La fila 1 completa se
+# vuelve a pedir en cada sincronización (es una sola fila) para notar si
+# alguien insertó o movió columnas; en ese caso la proyección se resuelve de
+# nuevo. Las filas resultantes conservan el orden y la posición de la hoja.
+
+
+def normalizar_encabezado(columna):
+    return columna.strip().lower().replace("í", "i")
+
+
+def _letra(indice):
+    return rowcol_to_a1(1, indice + 1).rstrip("0123456789")
+
+
+def _tramos(indices):
+    tramos = []
+    for i in indices:
+        if tramos and tramos[-1][1] == i - 1:
+            tramos[-1][1] = i
+        else:
+            tramos.append([i, i])
+    return [tuple(t) for t in tramos]
+
+
+class Proyeccion:
+    """Columnas de una hoja que se piden a la API, ubicadas por nombre.
+
+    Los nombres se comparan sin espacios, mayúsculas ni acentos, igual que
+    en el pipeline.
+    """
+
+    def __init__(self, nombre_hoja, columnas):
+        self.nombre_hoja = nombre_hoja
+        self.buscadas = {normalizar_encabezado(c) for c in columnas}
+        self.encabezados = None   # fila 1 completa con la que se resolvió
+        self.tramos = []          # [(columna_inicio, columna_fin)], base 0, inclusivos
+
+    @property
+    def resuelta(self):
+        return self.encabezados is not None
+
+    def resolver(self, encabezados):
+        self.encabezados = list(encabezados)
+        self.tramos = _tramos([i for i, c in enumerate(self.encabezados)
+                               if normalizar_encabezado(c) in self.buscadas])
+
+    def vigente(self, encabezados):
+        """¿Las columnas siguen donde se resolvieron?"""
+        return self.encabezados == list(encabezados)
+
+    @property
+    def encabezados_proyectados(self):
+        return [self.encabezados[i] for inicio, fin in self.tramos for i in range(inicio, fin + 1)]
+
+    def rango_encabezados(self):
+        return absolute_range_name(self.nombre_hoja, "1:1")
+
+    def rangos(self, fila_inicio=None, fila_fin=None):
+        """Un rango A1 por tramo; sin filas, las columnas completas (con encabezados)."""
+        desde = fila_inicio or ""
+        hasta = fila_fin or ""
+        return [absolute_range_name(self.nombre_hoja, f"{_letra(a)}{desde}:{_letra(b)}{hasta}")
+                for a, b in self.tramos]
+
+    def unir(self, value_ranges):
+        """Filas de la respuesta de `rangos()`: los tramos lado a lado, rellenados.
+
+        La API recorta celdas y filas vacías al final de cada rango, así que
+        cada tramo se rellena a su ancho y todos al número de filas del más largo.
+        """
+        tramos = [vr.get("values", []) for vr in value_ranges]
+        n = max((len(t) for t in tramos), default=0)
+        filas = None
+        for (a, b), valores in zip(self.tramos, tramos):
+            ancho = b - a + 1
+            valores = valores + [[]] * (n - len(valores))
+            rellenas = [c if len(c) == ancho else c + [""] * (ancho - len(c)) for c in valores]
+            filas = rellenas if filas is None else [x + y for x, y in zip(filas, rellenas)]
+        return filas or []
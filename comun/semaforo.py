@@ -0,0 +1,105 @@
+import numpy as np
+import pandas as pd
+
+# ==============================
+# --- Semáforo ---
+# ==============================
+VERDE, AMARILLO, ROJO, SIN_DATO = "🟢", "🟡", "🔴", "⚪"
+
+# Orden de las categorías = orden del tablero (rojo primero)
+ORDEN_SEMAFORO = [ROJO, AMARILLO, VERDE, SIN_DATO]
+TIPO_SEMAFORO = pd.CategoricalDtype(ORDEN_SEMAFORO, ordered=True)
+
+COLORES_SEMAFORO = {
+    VERDE: "#d4edda",
+    AMARILLO: "#fff3cd",
+    ROJO: "#f8d7da",
+    SIN_DATO: "#e9ecef",
+}
+
+# Umbrales por tablero: hasta "verde" es verde, hasta "amarillo" es amarillo,
+# más es rojo. Con limite_incluido=False el límite ya pasa al color siguiente
+# (x < 3h en lugar de x <= 3h).
+TABLEROS = {
+    "surtimiento": {
+        "verde": pd.Timedelta(hours=2, minutes=40),
+        "amarillo": pd.Timedelta(hours=3),
+        "limite_incluido": True,
+    },
+    "embarques": {
+        "verde": pd.Timedelta(hours=23),
+        "amarillo": pd.Timedelta(hours=24),
+        "limite_incluido": True,
+    },
+    "facturacion": {
+        "verde": pd.Timedelta(hours=3),
+        "amarillo": pd.Timedelta(hours=4),
+        "limite_incluido": True,
+    },
+    "facturacion_expo": {
+        "verde": pd.Timedelta(hours=3),
+        "amarillo": pd.Timedelta(hours=4),
+        "limite_incluido": False,
+    },
+}
+
+# Posición en ORDEN_SEMAFORO de verde (0), amarillo (1) y rojo (2)
+_CODIGOS = np.array([2, 1, 0], dtype=np.int8)
+_CODIGO_SIN_DATO = 3
+_TIPOS_NUMERICOS = ("floating", "integer", "mixed-integer-float", "decimal")
+
+
+def clasificar_semaforo(df, columna, tablero):
+    """Semáforo de `df[columna]` en una sola pasada, como categórico ordenado.
+
+    La columna puede ser timedelta o un número de horas. Si la columna no
+    existe todas las filas quedan en SIN_DATO.
+    """
+    config = TABLEROS[tablero]
+    if columna not in df.columns:
+        codigos = np.full(len(df), _CODIGO_SIN_DATO, dtype=np.int8)
+        return pd.Series(pd.Categorical.from_codes(codigos, dtype=TIPO_SEMAFORO), index=df.index)
+
+    valores = df[columna]
+    if pd.api.types.infer_dtype(valores, skipna=True) in _TIPOS_NUMERICOS:
+        # Horas como número
+        x = pd.to_numeric(valores, errors="coerce").to_numpy(dtype=float)
+        limites = np.array([config["verde"] / pd.Timedelta(hours=1),
+                            config["amarillo"] / pd.Timedelta(hours=1)])
+        nulos = np.isnan(x)
+    else:
+        x = pd.to_timedelta(valores, errors="coerce").to_numpy(dtype="timedelta64[ns]")
+        limites = np.array([config["verde"].to_timedelta64(),
+                            config["amarillo"].to_timedelta64()], dtype="timedelta64[ns]")
+        nulos = np.isnat(x)
+
+    lado = "left" if config["limite_incluido"] else "right"
+    tramo = np.searchsorted(limites, x, side=lado).clip(0, 2)
+    codigos = np.where(nulos, _CODIGO_SIN_DATO, _CODIGOS[tramo]).astype(np.int8)
+    return pd.Series(pd.Categorical.from_codes(codigos, dtype=TIPO_SEMAFORO), index=df.index)
+
+
+def contar_semaforo(semaforo):
+    """{color: cantidad} a partir de los códigos de la categoría."""
+    codigos = semaforo.cat.codes.to_numpy()
+    conteo = np.bincount(codigos[codigos >= 0], minlength=len(ORDEN_SEMAFORO))
+    return dict(zip(ORDEN_SEMAFORO, conteo.tolist()))
+
+
+def _formato(td, con_unidad=True):
+    horas, resto = divmod(int(td.total_seconds()), 3600)
+    minutos = resto // 60
+    if minutos:
+        return f"{horas}h{minutos}m" if con_unidad else f"{horas}h{minutos}"
+    return f"{horas}h" if con_unidad else f"{horas}"
+
+
+def etiquetas_kpi(tablero):
+    """Textos de las métricas verde/amarillo/rojo con los umbrales del tablero."""
+    config = TABLEROS[tablero]
+    verde, amarillo = config["verde"], config["amarillo"]
+    return (
+        f"{VERDE} Verde (≤{_formato(verde)})",
+        f"{AMARILLO} Amarillo ({_formato(verde, con_unidad=False)}–{_formato(amarillo)})",
+        f"{ROJO} Rojo (>{_formato(amarillo)})",
+    )
@@ -0,0 +1,432 @@
+import json
+import os
+import threading
+import time
+from collections import deque
+from typing import NamedTuple
+
+import streamlit as st
+import gspread
+from gspread.utils import absolute_range_name, fill_gaps
+from google.oauth2.service_account import Credentials
+
+from comun.cliente import cliente_sheets
+from comun.delta import SincronizadorDelta
+from comun.proyeccion import Proyeccion
+from comun.metricas import al_responder_api, iniciar_endpoint, medir
+from comun.sheets_local import abrir_local
+from comun.snapshots import guardar_snapshot, leer_snapshot, antiguedad
+
+# ==============================
+# --- Configuración ---
+# ==============================
+SPREADSHEET_KEY = "1UTPaPqfVZ5Z6dmlz9OMPp4W1mMcot9_piz7Bctr5S-I"
+# Las pantallas sólo leen; el cliente con permiso de escritura es aparte y
+# sólo lo pide quien escribe (cronómetros de P1)
+SCOPES_LECTURA = ["https://www.googleapis.com/auth/spreadsheets.readonly"]
+SCOPES_ESCRITURA = ["https://www.googleapis.com/auth/spreadsheets"]
+
+# Antigüedad normal de una lectura de hoja, en segundos
+TTL_LECTURA = int(os.environ.get("PANTALLAS_TTL_LECTURA", "60"))
+# Cada cuántos segundos el sondeo del proceso vuelve a leer las hojas
+INTERVALO_SONDEO = int(os.environ.get("PANTALLAS_INTERVALO_SONDEO", str(TTL_LECTURA)))
+# A partir de esta antigüedad las pantallas muestran el aviso de datos viejos
+ANTIGUEDAD_AVISO = int(os.environ.get("PANTALLAS_ANTIGUEDAD_AVISO", str(3 * TTL_LECTURA)))
+# "google" o "local" (comun/sheets_local.py: hojas de una carpeta, sin red)
+BACKEND = os.environ.get("PANTALLAS_BACKEND", "google")
+# Hojas que se sincronizan por bloques en lugar de descargarse completas
+HOJAS_DELTA = tuple(n.strip() for n in os.environ.get("PANTALLAS_HOJAS_DELTA", "Logistica").split(",") if n.strip())
+
+
+# ==============================
+# --- Conexión Google Sheets ---
+# ==============================
+def _credenciales_google():
+    try:
+        # Cloud
+        return dict(st.secrets["google"])
+    except Exception:
+        # Local
+        with open("secrets.json", "r", encoding="utf-8") as f:
+            return json.load(f)
+
+
+@st.cache_resource(show_spinner=False)
+def _spreadsheet_local():
+    # Una sola copia para lecturas y escrituras: si no, P1 escribe en una y
+    # el sondeo lee otra, y la cuota simulada se reparte entre las dos
+    return abrir_local()
+
+
+@st.cache_resource(show_spinner=False)
+def abrir_spreadsheet(escritura=False):
+    """Cliente autorizado compartido por todas las sesiones del proceso.
+
+    De sólo lectura salvo con `escritura=True`.
+    """
+    iniciar_endpoint()
+    if BACKEND == "local":
+        return _spreadsheet_local()
+    scopes = SCOPES_ESCRITURA if escritura else SCOPES_LECTURA
+    credenciales = Credentials.from_service_account_info(_credenciales_google(), scopes=scopes)
+    gc = gspread.authorize(credenciales)
+    # Cada petición HTTP a la API queda en las métricas (tiempo y bytes)
+    gc.http_client.session.hooks["response"].append(al_responder_api)
+    return gc.open_by_key(SPREADSHEET_KEY)
+
+
+@st.cache_resource(show_spinner=False)
+def obtener_hoja(nombre_hoja, escritura=False):
+    return cliente_sheets().leer(abrir_spreadsheet(escritura).worksheet, nombre_hoja)
+
+
+# ==============================
+# --- Lecturas cacheadas ---
+# ==============================
+def _pedir_rangos(sh, rangos):
+    # Lecturas idénticas simultáneas (sondeo y arranque en frío) viajan una vez
+    return cliente_sheets().leer(sh.values_batch_get, rangos, clave=("lote", tuple(rangos)))
+
+
+def _resolver_proyecciones(sh, almacen, nombres_hojas):
+    """Ubica las columnas de las proyecciones sin resolver: sólo la fila 1."""
+    pendientes = [n for n in nombres_hojas
+                  if n in almacen["proyecciones"] and not almacen["proyecciones"][n].resuelta]
+    if not pendientes:
+        return
+    _contar_llamada(almacen)
+    respuesta = _pedir_rangos(sh, [almacen["proyecciones"][n].rango_encabezados() for n in pendientes])
+    for nombre, rango in zip(pendientes, respuesta.get("valueRanges", [])):
+        almacen["proyecciones"][nombre].resolver((rango.get("values") or [[]])[0])
+
+
+def _rangos_completos(almacen, nombre_hoja):
+    proyeccion = almacen["proyecciones"].get(nombre_hoja)
+    if proyeccion is None:
+        return [absolute_range_name(nombre_hoja)]
+    return [proyeccion.rango_encabezados()] + proyeccion.rangos()
+
+
+def _filas_completas(almacen, nombre_hoja, value_ranges):
+    """Filas de una descarga completa, o None si las columnas de la
+    proyección se movieron (queda resuelta de nuevo para el siguiente intento)."""
+    proyeccion = almacen["proyecciones"].get(nombre_hoja)
+    if proyeccion is None:
+        filas = value_ranges[0].get("values", [])
+        return fill_gaps(filas) if filas else []
+    encabezados = (value_ranges[0].get("values") or [[]])[0]
+    if not proyeccion.vigente(encabezados):
+        proyeccion.resolver(encabezados)
+        return None
+    return proyeccion.unir(value_ranges[1:])
+
+
+def _descargar_completas(sh, almacen, nombres_hojas):
+    valores = {}
+    pendientes = list(nombres_hojas)
+    # Un segundo intento por si las columnas se movieron entre la fila 1 y los datos
+    for _ in range(2):
+        planes, rangos = {}, []
+        for nombre in pendientes:
+            planes[nombre] = len(rangos)
+            rangos.extend(_rangos_completos(almacen, nombre))
+        _contar_llamada(almacen)
+        value_ranges = _pedir_rangos(sh, rangos).get("valueRanges", [])
+        limites = list(planes.values()) + [len(rangos)]
+        for (nombre, i), fin in zip(planes.items(), limites[1:]):
+            filas = _filas_completas(almacen, nombre, value_ranges[i:fin])
+            if filas is not None:
+                valores[nombre] = filas
+        pendientes = [n for n in pendientes if n not in valores]
+        if not pendientes:
+            return valores
+    raise ValueError(f"Las columnas de {', '.join(pendientes)} cambiaron durante la descarga")
+
+
+def _descargar_lote(sh, almacen, nombres_hojas):
+    """Valores de varias hojas en una sola llamada `values_batch_get`.
+
+    Las hojas de HOJAS_DELTA con datos previos sólo piden sus rangos
+    incrementales dentro de la misma llamada, y las hojas con proyección
+    sólo sus columnas. Devuelve ({nombre_hoja: filas}, nombres que
+    cambiaron) con las filas rellenadas igual que `get_all_values()`.
+    """
+    _resolver_proyecciones(sh, almacen, nombres_hojas)
+    planes = {}
+    rangos = []
+    for nombre in nombres_hojas:
+        sinc = almacen["delta"].get(nombre)
+        rangos_delta = sinc.rangos() if sinc is not None else None
+        if rangos_delta:
+            planes[nombre] = (len(rangos), len(rangos_delta), True)
+            rangos.extend(rangos_delta)
+        else:
+            completos = _rangos_completos(almacen, nombre)
+            planes[nombre] = (len(rangos), len(completos), False)
+            rangos.extend(completos)
+    _contar_llamada(almacen)
+    with medir("sheets.descarga") as medicion:
+        respuesta = _pedir_rangos(sh, rangos)
+        value_ranges = respuesta.get("valueRanges", [])
+        medicion.filas = sum(len(r.get("values", [])) for r in value_ranges)
+
+    valores, cambiadas, incoherentes = {}, set(), []
+    for nombre, (i, n, es_delta) in planes.items():
+        if not es_delta:
+            filas = _filas_completas(almacen, nombre, value_ranges[i:i + n])
+            if filas is None:
+                incoherentes.append(nombre)
+                continue
+            valores[nombre] = filas
+            anterior = almacen["hojas"].get(nombre)
+            if anterior is None or anterior.filas != filas:
+                cambiadas.add(nombre)
+            if nombre in HOJAS_DELTA:
+                _sincronizador(almacen, nombre).iniciar(filas)
+            continue
+        resultado = almacen["delta"][nombre].aplicar(value_ranges[i:i + n])
+        if resultado is None:
+            # La fila 1 ya vino en la respuesta: la proyección se ubica con ella
+            proyeccion = almacen["proyecciones"].get(nombre)
+            encabezados = (value_ranges[i].get("values") or [[]])[0]
+            if proyeccion is not None and not proyeccion.vigente(encabezados):
+                proyeccion.resolver(encabezados)
+            incoherentes.append(nombre)
+        else:
+            valores[nombre], cambio = resultado
+            if cambio:
+                cambiadas.add(nombre)
+
+    # Columnas nuevas o movidas, o filas borradas a mitad de hoja: descarga completa
+    if incoherentes:
+        for nombre, filas in _descargar_completas(sh, almacen, incoherentes).items():
+            if nombre in HOJAS_DELTA:
+                _sincronizador(almacen, nombre).iniciar(filas)
+            valores[nombre] = filas
+            cambiadas.add(nombre)
+    return valores, cambiadas
+
+
+class VersionHoja(NamedTuple):
+    """Lectura publicada de una hoja. Nunca se modifica: cada cambio es una
+    versión nueva con un número mayor. `de_api` es False mientras sólo se
+    tiene el snapshot en disco."""
+    numero: int
+    filas: list
+    leido_en: float
+    de_api: bool = True
+
+
+@st.cache_resource(show_spinner=False)
+def _almacen():
+    # Última versión conocida de cada hoja, compartida por todas las sesiones:
+    # {nombre_hoja: VersionHoja}. "suscritas" son las hojas que alguna
+    # pantalla ha pedido y que el sondeo mantiene al día. "despertar" adelanta
+    # el siguiente ciclo del sondeo.
+    return {
+        "hojas": {}, "delta": {}, "refrescando": set(), "errores": {},
+        "suscritas": set(), "proyecciones": {}, "version": 0,
+        "llamadas": deque(), "llamadas_total": 0, "lecturas_total": 0,
+        "al_refrescar": [], "despertar": threading.Event(), "lock": threading.Lock(),
+    }
+
+
+def _sincronizador(almacen, nombre_hoja):
+    if nombre_hoja not in almacen["delta"]:
+        almacen["delta"][nombre_hoja] = SincronizadorDelta(nombre_hoja, almacen["proyecciones"].get(nombre_hoja))
+    return almacen["delta"][nombre_hoja]
+
+
+def _contar_llamada(almacen):
+    ahora = time.time()
+    with almacen["lock"]:
+        almacen["llamadas"].append(ahora)
+        almacen["llamadas_total"] += 1
+        while almacen["llamadas"] and almacen["llamadas"][0] < ahora - 60:
+            almacen["llamadas"].popleft()
+
+
+def _publicar(almacen, nombre_hoja, filas, leido_en, cambio=True, de_api=True):
+    """Publica una versión nueva si la hoja cambió; si no, sólo renueva la hora."""
+    anterior = almacen["hojas"].get(nombre_hoja)
+    if anterior is not None and not cambio:
+        with almacen["lock"]:
+            almacen["hojas"][nombre_hoja] = anterior._replace(leido_en=leido_en, de_api=de_api)
+        return
+    with almacen["lock"]:
+        almacen["version"] += 1
+        almacen["hojas"][nombre_hoja] = VersionHoja(almacen["version"], filas, leido_en, de_api)
+
+
+def _refrescar(sh, almacen, nombres_hojas):
+    try:
+        valores, cambiadas = _descargar_lote(sh, almacen, nombres_hojas)
+    except Exception as e:
+        with almacen["lock"]:
+            for nombre in nombres_hojas:
+                almacen["errores"][nombre] = str(e)
+        raise
+    else:
+        ahora = time.time()
+        for nombre, filas in valores.items():
+            _publicar(almacen, nombre, filas, ahora, nombre in cambiadas)
+        with almacen["lock"]:
+            for nombre in valores:
+                almacen["errores"].pop(nombre, None)
+        for nombre in cambiadas:
+            guardar_snapshot(nombre, valores[nombre])
+        return valores
+    finally:
+        with almacen["lock"]:
+            almacen["refrescando"].difference_update(nombres_hojas)
+
+
+# ==============================
+# --- Sondeo en segundo plano ---
+# ==============================
+# Un solo hilo por proceso refresca todas las hojas suscritas cada
+# INTERVALO_SONDEO segundos en una sola llamada. Las sesiones nunca llaman a
+# la API salvo la primera vez que se pide una hoja sin snapshot: las llamadas
+# por minuto no dependen de cuántas pantallas estén abiertas.
+@st.cache_resource(show_spinner=False)
+def _sondeo(_sh):
+    almacen = _almacen()
+
+    def ciclo():
+        while True:
+            almacen["despertar"].wait(INTERVALO_SONDEO)
+            almacen["despertar"].clear()
+            with almacen["lock"]:
+                pendientes = tuple(sorted(almacen["suscritas"] - almacen["refrescando"]))
+                almacen["refrescando"].update(pendientes)
+            if not pendientes:
+                continue
+            try:
+                _refrescar(_sh, almacen, pendientes)
+            except Exception:
+                # El error queda en almacen["errores"]; se siguen sirviendo los datos viejos
+                continue
+            with almacen["lock"]:
+                funciones = list(almacen["al_refrescar"])
+            for funcion in funciones:
+                try:
+                    funcion()
+                except Exception:
+                    # Un suscriptor con error no detiene el sondeo
+                    pass
+
+    hilo = threading.Thread(target=ciclo, name="sondeo-sheets", daemon=True)
+    hilo.start()
+    return hilo
+
+
+def al_refrescar(funcion):
+    """Llama a `funcion()` en el hilo del sondeo después de cada refresco exitoso."""
+    almacen = _almacen()
+    with almacen["lock"]:
+        almacen["al_refrescar"].append(funcion)
+
+
+def leer_versiones(nombres_hojas, columnas=None):
+    """{nombre_hoja: VersionHoja} con lo último que publicó el sondeo.
+
+    Al arrancar en frío se usa el snapshot en disco y el sondeo se adelanta
+    para leer la hoja de la API. Sólo se bloquea cuando no hay ningún dato
+    previo de la hoja. `columnas` ({nombre_hoja: nombres})
+    limita qué columnas se descargan de cada hoja; la primera proyección
+    pedida para una hoja es la que usa todo el proceso.
+    """
+    with medir("sheets.lectura"):
+        return _leer_versiones(nombres_hojas, columnas or {})
+
+
+def _leer_versiones(nombres_hojas, columnas):
+    almacen = _almacen()
+    with almacen["lock"]:
+        for nombre, nombres_columnas in columnas.items():
+            if nombre not in almacen["proyecciones"]:
+                almacen["proyecciones"][nombre] = Proyeccion(nombre, nombres_columnas)
+        almacen["suscritas"].update(nombres_hojas)
+        almacen["lecturas_total"] += 1
+        conocidas = {n: almacen["hojas"][n] for n in nombres_hojas if n in almacen["hojas"]}
+
+    # Arranque en frío: cargar del snapshot en disco
+    for nombre in nombres_hojas:
+        if nombre not in conocidas:
+            snapshot = leer_snapshot(nombre)
+            if snapshot is not None:
+                filas, leido_en = snapshot
+                with almacen["lock"]:
+                    if nombre in HOJAS_DELTA and nombre not in almacen["delta"]:
+                        # El snapshot puede ser viejo: se muestra, pero el primer
+                        # sondeo descarga la hoja completa
+                        _sincronizador(almacen, nombre).iniciar(filas, sembrado=False)
+                with almacen["lock"]:
+                    publicada = nombre in almacen["hojas"]
+                if not publicada:
+                    _publicar(almacen, nombre, filas, leido_en, de_api=False)
+                    # Se muestra ya, pero el sondeo la lee de la API sin esperar su intervalo
+                    almacen["despertar"].set()
+                with almacen["lock"]:
+                    conocidas[nombre] = almacen["hojas"][nombre]
+
+    sh = abrir_spreadsheet()
+    _sondeo(sh)
+    faltantes = tuple(n for n in nombres_hojas if n not in conocidas)
+    if faltantes:
+        with almacen["lock"]:
+            almacen["refrescando"].update(faltantes)
+        _refrescar(sh, almacen, faltantes)
+        with almacen["lock"]:
+            conocidas.update({n: almacen["hojas"][n] for n in faltantes})
+
+    return {nombre: conocidas[nombre] for nombre in nombres_hojas}
+
+
+def leida_de_api(nombre_hoja):
+    """¿La versión vigente de la hoja viene de la API en este proceso (no de
+    un snapshot)? Quien escribe por número de fila debe esperar a que sí."""
+    almacen = _almacen()
+    with almacen["lock"]:
+        version = almacen["hojas"].get(nombre_hoja)
+    return version is not None and version.de_api
+
+
+def estado_datos(*nombres_hojas):
+    """(antigüedad en segundos de la hoja más vieja, último error o None)."""
+    almacen = _almacen()
+    with almacen["lock"]:
+        lecturas = [almacen["hojas"][n].leido_en for n in nombres_hojas if n in almacen["hojas"]]
+        errores = [almacen["errores"][n] for n in nombres_hojas if n in almacen["errores"]]
+    edad = antiguedad(min(lecturas)) if lecturas else None
+    return edad, (errores[0] if errores else None)
+
+
+def mostrar_frescura(*nombres_hojas):
+    """Insignia de datos desactualizados cuando Sheets va lento o está limitado."""
+    edad, error = estado_datos(*nombres_hojas)
+    if edad is None or edad < ANTIGUEDAD_AVISO:
+        return
+    minutos = int(edad // 60)
+    texto = f"🕒 Datos de hace {minutos} min" if minutos else f"🕒 Datos de hace {int(edad)} s"
+    if error:
+        texto += " · sin respuesta de Google Sheets"
+    st.markdown(
+        f"<span style='background-color:#fff3cd; color:#856404; border-radius:6px;"
+        f" padding:2px 8px; font-size:12px;'>{texto}</span>",
+        unsafe_allow_html=True
+    )
+
+
+def estadisticas_api():
+    """Llamadas a la API (total y último minuto) frente a lecturas servidas."""
+    almacen = _almacen()
+    ahora = time.time()
+    with almacen["lock"]:
+        return {
+            "llamadas_total": almacen["llamadas_total"],
+            "llamadas_ultimo_minuto": sum(1 for t in almacen["llamadas"] if t >= ahora - 60),
+            "lecturas_total": almacen["lecturas_total"],
+            "hojas_suscritas": sorted(almacen["suscritas"]),
+            "versiones": {n: v.numero for n, v in almacen["hojas"].items()},
+        }
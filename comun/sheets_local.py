@@ -0,0 +1,273 @@
+import csv
+import os
+import random
+import re
+import threading
+import time
+from collections import deque
+
+import pandas as pd
+from gspread.exceptions import APIError, WorksheetNotFound
+from gspread.utils import a1_range_to_grid_range, fill_gaps, numericise_all, to_records
+
+from comun.metricas import registrar
+from comun.snapshots import nombre_seguro
+
+# ==============================
+# --- Hoja de cálculo local ---
+# ==============================
+# Sustituto en memoria del subconjunto de gspread que usan las pantallas,
+# para correrlas sin credenciales ni red (PANTALLAS_BACKEND=local). Las hojas
+# se cargan de una carpeta con un archivo por hoja:
+#   - CSV: filas tal cual, encabezados en la primera.
+#   - Parquet: el formato de los snapshots (columnas c0..cN, encabezados en
+#     la primera fila) o una tabla normal (encabezados = columnas).
+# Cada llamada a la "API" espera LATENCIA segundos y cuenta contra una cuota
+# por minuto; al pasarla se lanza el mismo APIError 429 que Google.
+CARPETA_DATOS = os.environ.get("PANTALLAS_LOCAL_DATOS", "datos_locales")
+LATENCIA = float(os.environ.get("PANTALLAS_LOCAL_LATENCIA", "0.3"))
+# Variación aleatoria de la latencia (0.5 = ±50 %)
+VARIACION_LATENCIA = float(os.environ.get("PANTALLAS_LOCAL_VARIACION", "0.5"))
+# Llamadas permitidas por minuto, de lectura y de escritura por separado;
+# 0 = sin límite (Google: 60 de cada una por usuario)
+CUOTA_POR_MINUTO = int(os.environ.get("PANTALLAS_LOCAL_CUOTA", "60"))
+
+_PATRON_RANGO = re.compile(r"^(?:'((?:[^']|'')*)'|([^!]+))(?:!(.*))?$")
+
+
+class _RespuestaError:
+    """Lo mínimo de `requests.Response` que necesita `APIError`."""
+
+    def __init__(self, codigo, mensaje, estado):
+        self.status_code = codigo
+        self.text = mensaje
+        self._error = {"code": codigo, "message": mensaje, "status": estado}
+
+    def json(self):
+        return {"error": self._error}
+
+
+def _error_api(codigo, mensaje, estado):
+    return APIError(_RespuestaError(codigo, mensaje, estado))
+
+
+def _recortar(filas):
+    # La API no devuelve celdas vacías al final de cada fila ni filas vacías al final
+    recortadas = []
+    for fila in filas:
+        fin = len(fila)
+        while fin and fila[fin - 1] == "":
+            fin -= 1
+        recortadas.append(fila[:fin])
+    while recortadas and not recortadas[-1]:
+        recortadas.pop()
+    return recortadas
+
+
+def _a_texto(valor):
+    if valor is None or (isinstance(valor, float) and pd.isna(valor)):
+        return ""
+    return str(valor)
+
+
+def leer_carpeta(carpeta):
+    """{nombre_hoja: filas} de todos los CSV y Parquet de la carpeta."""
+    hojas = {}
+    for archivo in sorted(os.listdir(carpeta)):
+        nombre, extension = os.path.splitext(archivo)
+        ruta = os.path.join(carpeta, archivo)
+        if extension == ".csv":
+            with open(ruta, newline="", encoding="utf-8") as f:
+                hojas[nombre] = [list(fila) for fila in csv.reader(f)]
+        elif extension == ".parquet":
+            df = pd.read_parquet(ruta)
+            filas = [[_a_texto(v) for v in fila] for fila in df.itertuples(index=False)]
+            if all(re.fullmatch(r"c\d+", str(c)) for c in df.columns):
+                hojas[nombre] = filas
+            else:
+                hojas[nombre] = [[str(c) for c in df.columns]] + filas
+    return hojas
+
+
+class _Cuota:
+    def __init__(self, por_minuto, metrica):
+        self.por_minuto = por_minuto
+        self.metrica = metrica
+        self._llamadas = deque()
+
+    def consumir(self, ahora):
+        if not self.por_minuto:
+            return
+        while self._llamadas and self._llamadas[0] <= ahora - 60:
+            self._llamadas.popleft()
+        if len(self._llamadas) >= self.por_minuto:
+            raise _error_api(429, f"Quota exceeded for quota metric '{self.metrica}' (simulado)",
+                             "RESOURCE_EXHAUSTED")
+        self._llamadas.append(ahora)
+
+
+class SpreadsheetLocal:
+    """Spreadsheet en memoria con latencia y cuota simuladas."""
+
+    def __init__(self, hojas, latencia=LATENCIA, variacion=VARIACION_LATENCIA,
+                 cuota_por_minuto=CUOTA_POR_MINUTO, semilla=None):
+        self.title = "Pantallas (local)"
+        self.latencia = latencia
+        self.variacion = variacion
+        self.llamadas = 0
+        self.rechazadas = 0
+        self._cuotas = {
+            False: _Cuota(cuota_por_minuto, "Read requests"),
+            True: _Cuota(cuota_por_minuto, "Write requests"),
+        }
+        self._aleatorio = random.Random(semilla)
+        self._hojas = {nombre: HojaLocal(self, nombre, filas) for nombre, filas in hojas.items()}
+        self._lock = threading.Lock()
+
+    def _llamada(self, escritura=False):
+        """Una petición a la "API": cuota y luego latencia."""
+        with self._lock:
+            try:
+                self._cuotas[escritura].consumir(time.time())
+            except APIError:
+                self.rechazadas += 1
+                raise
+            self.llamadas += 1
+            espera = self.latencia * (1 + self.variacion * self._aleatorio.uniform(-1, 1))
+        if espera > 0:
+            time.sleep(espera)
+        registrar("api.escritura" if escritura else "api.lectura", max(espera, 0.0))
+
+    def _hoja(self, nombre):
+        if nombre in self._hojas:
+            return self._hojas[nombre]
+        # Los snapshots guardan "Ped Pendientes" como "Ped_Pendientes"
+        for hoja in self._hojas.values():
+            if nombre_seguro(hoja.title) == nombre_seguro(nombre):
+                return hoja
+        raise WorksheetNotFound(nombre)
+
+    def _rango(self, rango):
+        coincidencia = _PATRON_RANGO.match(rango)
+        if coincidencia is None:
+            raise _error_api(400, f"Unable to parse range: {rango}", "INVALID_ARGUMENT")
+        citado, simple, a1 = coincidencia.groups()
+        nombre = citado.replace("''", "'") if citado is not None else simple
+        return self._hoja(nombre), a1
+
+    def worksheet(self, title):
+        self._llamada()
+        return self._hoja(title)
+
+    def worksheets(self):
+        self._llamada()
+        return list(self._hojas.values())
+
+    def values_batch_get(self, ranges, params=None):
+        self._llamada()
+        respuesta = []
+        for rango in ranges:
+            hoja, a1 = self._rango(rango)
+            respuesta.append({"range": rango, "majorDimension": "ROWS", "values": hoja._valores(a1)})
+        return {"spreadsheetId": "local", "valueRanges": respuesta}
+
+
+class HojaLocal:
+    """Worksheet en memoria. Las lecturas devuelven copias."""
+
+    def __init__(self, spreadsheet, title, filas):
+        self.spreadsheet = spreadsheet
+        self.title = title
+        self._filas = [list(fila) for fila in filas]
+        self._lock = threading.Lock()
+
+    def __repr__(self):
+        return f"<HojaLocal {self.title!r} {len(self._filas)} filas>"
+
+    @property
+    def row_count(self):
+        return len(self._filas)
+
+    @property
+    def col_count(self):
+        return max((len(f) for f in self._filas), default=0)
+
+    # ------------------------------
+    def _valores(self, a1=None):
+        with self._lock:
+            if not a1:
+                return _recortar([list(f) for f in self._filas])
+            grid = a1_range_to_grid_range(a1)
+            fila_ini = grid.get("startRowIndex", 0)
+            fila_fin = grid.get("endRowIndex", len(self._filas))
+            col_ini = grid.get("startColumnIndex", 0)
+            col_fin = grid.get("endColumnIndex")
+            return _recortar([list(f[col_ini:col_fin]) for f in self._filas[fila_ini:fila_fin]])
+
+    def _escribir(self, fila, col, valor):
+        # fila y col empiezan en 1, como en gspread
+        while len(self._filas) < fila:
+            self._filas.append([])
+        celdas = self._filas[fila - 1]
+        if len(celdas) < col:
+            celdas.extend([""] * (col - len(celdas)))
+        celdas[col - 1] = _a_texto(valor)
+
+    def _escribir_rango(self, a1, valores):
+        grid = a1_range_to_grid_range(a1)
+        fila_ini = grid.get("startRowIndex", 0)
+        col_ini = grid.get("startColumnIndex", 0)
+        for i, fila in enumerate(valores):
+            for j, valor in enumerate(fila):
+                self._escribir(fila_ini + i + 1, col_ini + j + 1, valor)
+
+    # ------------------------------
+    def get(self, range_name=None, **kwargs):
+        self.spreadsheet._llamada()
+        valores = self._valores(range_name)
+        if kwargs.get("pad_values"):
+            valores = fill_gaps(valores) if valores else [[]]
+        return valores
+
+    def get_all_values(self, **kwargs):
+        self.spreadsheet._llamada()
+        valores = self._valores()
+        return fill_gaps(valores) if valores else []
+
+    def get_all_records(self, head=1, numericise_ignore=(), **kwargs):
+        valores = self.get_all_values()
+        if not valores:
+            return []
+        encabezados, filas = valores[head - 1], valores[head:]
+        if list(numericise_ignore) != ["all"]:
+            filas = [numericise_all(fila, ignore=list(numericise_ignore)) for fila in filas]
+        return to_records(encabezados, filas)
+
+    def row_values(self, row, **kwargs):
+        self.spreadsheet._llamada()
+        valores = self._valores(f"{row}:{row}")
+        return valores[0] if valores else []
+
+    def update_cell(self, row, col, value):
+        self.spreadsheet._llamada(escritura=True)
+        with self._lock:
+            self._escribir(row, col, value)
+        return {"updatedCells": 1}
+
+    def update(self, values=None, range_name=None, **kwargs):
+        self.spreadsheet._llamada(escritura=True)
+        with self._lock:
+            self._escribir_rango(range_name or "A1", values or [[]])
+        return {"updatedCells": sum(len(f) for f in values or [])}
+
+    def batch_update(self, data, **kwargs):
+        self.spreadsheet._llamada(escritura=True)
+        with self._lock:
+            for bloque in data:
+                self._escribir_rango(bloque["range"], bloque["values"])
+        return {"totalUpdatedCells": sum(len(f) for b in data for f in b["values"])}
+
+
+def abrir_local(carpeta=CARPETA_DATOS, **opciones):
+    """SpreadsheetLocal con las hojas de `carpeta`."""
+    return SpreadsheetLocal(leer_carpeta(carpeta), **opciones)
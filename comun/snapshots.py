@@ -0,0 +1,46 @@
+import os
+import time
+
+import pandas as pd
+
+# ==============================
+# --- Snapshots Parquet en disco ---
+# ==============================
+# Cada hoja se guarda tal cual llega de Sheets (encabezados incluidos como
+# primera fila) para poder arrancar sin esperar a la API.
+SNAPSHOTS_DIR = os.environ.get("PANTALLAS_SNAPSHOTS_DIR", ".snapshots")
+
+
+def nombre_seguro(nombre_hoja):
+    return "".join(c if c.isalnum() else "_" for c in nombre_hoja)
+
+
+def _ruta(nombre_hoja):
+    return os.path.join(SNAPSHOTS_DIR, f"{nombre_seguro(nombre_hoja)}.parquet")
+
+
+def guardar_snapshot(nombre_hoja, filas):
+    if not filas:
+        return
+    os.makedirs(SNAPSHOTS_DIR, exist_ok=True)
+    ruta = _ruta(nombre_hoja)
+    temporal = f"{ruta}.{os.getpid()}.tmp"
+    ancho = max(len(f) for f in filas)
+    df = pd.DataFrame(filas, columns=[f"c{i}" for i in range(ancho)]).fillna("")
+    df.to_parquet(temporal, index=False)
+    # Reemplazo atómico: nunca se lee un snapshot a medio escribir
+    os.replace(temporal, ruta)
+
+
+def leer_snapshot(nombre_hoja):
+    """(filas, epoch de escritura) del último snapshot, o None si no existe."""
+    ruta = _ruta(nombre_hoja)
+    try:
+        df = pd.read_parquet(ruta)
+        return df.values.tolist(), os.path.getmtime(ruta)
+    except (FileNotFoundError, OSError, ValueError):
+        return None
+
+
+def antiguedad(leido_en):
+    return time.time() - leido_en
@@ -0,0 +1,152 @@
+import html
+import math
+import os
+import time
+
+import numpy as np
+import pandas as pd
+import streamlit as st
+
+from comun.metricas import medir
+from comun.semaforo import COLORES_SEMAFORO, ROJO
+
+# ==============================
+# --- Tablero tipo grid ---
+# ==============================
+# Todo el tablero se arma como un solo bloque HTML con CSS grid: un único
+# elemento de Streamlit sin importar cuántas remisiones haya. El número de
+# columnas se ajusta al ancho de la pantalla.
+COLOR_COMPLETADO = "#cce5ff"  # azul claro
+ETIQUETA_COMPLETADO = "⚡ LISTO"
+
+# Modo kiosco (pantallas de TV): el tablero se parte en páginas que rotan
+# solas. Se activa con ?kiosco=1 en la URL o con PANTALLAS_KIOSCO=1.
+KIOSCO = os.environ.get("PANTALLAS_KIOSCO", "0") == "1"
+# ~24 columnas x 12 filas caben en una TV 1080p con los KPIs arriba
+TARJETAS_POR_PAGINA = int(os.environ.get("PANTALLAS_KIOSCO_TARJETAS", "288"))
+ROTACION_SEGUNDOS = int(os.environ.get("PANTALLAS_KIOSCO_ROTACION", "20"))
+
+_ESTILOS = """<style>
+.tablero-remisiones {
+    display:grid;
+    grid-template-columns:repeat(auto-fill, minmax(76px, 1fr));
+    gap:4px;
+}
+.tablero-remisiones .tarjeta {
+    border-radius:6px;
+    padding:6px;
+    text-align:center;
+    color:black;
+    font-size:12px;
+    white-space:nowrap;
+    overflow:hidden;
+}
+.tablero-remisiones .listo {
+    font-size:10px;
+    color:#004085;
+}
+</style>"""
+
+
+def tarjetas_html(remisiones, semaforos, completados=None):
+    """Serie con el HTML de cada tarjeta, armado columna por columna."""
+    remisiones = remisiones.astype(str).map(html.escape)
+    semaforos = semaforos.astype(str)
+    colores = semaforos.map(COLORES_SEMAFORO).fillna(COLORES_SEMAFORO["⚪"])
+    contenido = "<strong>" + remisiones + "</strong><br>" + semaforos
+    if completados is not None:
+        completados = completados.fillna(False).astype(bool)
+        colores = colores.where(~completados, COLOR_COMPLETADO)
+        etiqueta = pd.Series("", index=completados.index).where(
+            ~completados, f"<br><span class='listo'>{ETIQUETA_COMPLETADO}</span>")
+        contenido = contenido + etiqueta
+    return "<div class='tarjeta' style='background-color:" + colores + ";'>" + contenido + "</div>"
+
+
+def html_tablero(remisiones, semaforos, completados=None):
+    tarjetas = tarjetas_html(remisiones, semaforos, completados)
+    return _ESTILOS + "<div class='tablero-remisiones'>" + "".join(tarjetas.tolist()) + "</div>"
+
+
+def modo_kiosco():
+    return KIOSCO or st.query_params.get("kiosco", "0") == "1"
+
+
+def paginas_kiosco(semaforos, tarjetas_por_pagina=None):
+    """Posiciones de las tarjetas de cada página; todas aparecen en alguna.
+
+    Si las rojas ocupan hasta la mitad de una página se fijan en todas y las
+    demás rotan en el espacio libre. Si son más, las páginas recorren primero
+    las rojas y luego el resto, en orden.
+    """
+    tarjetas_por_pagina = tarjetas_por_pagina or TARJETAS_POR_PAGINA
+    rojas = np.flatnonzero((semaforos == ROJO).to_numpy())
+    otras = np.flatnonzero((semaforos != ROJO).to_numpy())
+    if len(rojas) > tarjetas_por_pagina // 2:
+        todas = np.concatenate([rojas, otras])
+        return [todas[i:i + tarjetas_por_pagina] for i in range(0, len(todas), tarjetas_por_pagina)]
+    libres = tarjetas_por_pagina - len(rojas)
+    n_paginas = max(1, math.ceil(len(otras) / libres))
+    return [np.concatenate([rojas, otras[p * libres:(p + 1) * libres]]) for p in range(n_paginas)]
+
+
+def pagina_vigente(n_paginas, ahora=None):
+    """Página que toca mostrar según el reloj: cada una dura ROTACION_SEGUNDOS
+    aunque la página se vuelva a ejecutar por otros motivos."""
+    ahora = time.time() if ahora is None else ahora
+    return int(ahora // ROTACION_SEGUNDOS) % n_paginas
+
+
+@st.fragment(run_every=ROTACION_SEGUNDOS)
+def _pagina_kiosco(df, col_remision, col_semaforo, col_completado):
+    # Definido una sola vez: el navegador lo dispara cada ROTACION_SEGUNDOS
+    # y sólo se arma y se envía la página visible.
+    paginas = paginas_kiosco(df[col_semaforo])
+    pagina = pagina_vigente(len(paginas))
+    visibles = df.iloc[paginas[pagina]]
+    completados = visibles[col_completado] if col_completado else None
+    with medir("tablero.html", filas=len(visibles)) as medicion:
+        contenido = html_tablero(visibles[col_remision], visibles[col_semaforo], completados)
+        medicion.bytes = len(contenido)
+        st.markdown(contenido, unsafe_allow_html=True)
+    st.caption(f"Página {pagina + 1}/{len(paginas)} · {len(df)} remisiones")
+
+
+def mostrar_tablero(df, col_remision, col_semaforo, col_completado=None):
+    """Dibuja el tablero completo en un solo `st.markdown`.
+
+    En modo kiosco, si no cabe en una pantalla, muestra una página a la vez
+    y rota automáticamente.
+    """
+    if df.empty:
+        return
+    if modo_kiosco() and len(df) > TARJETAS_POR_PAGINA:
+        _pagina_kiosco(df, col_remision, col_semaforo, col_completado)
+        return
+    completados = df[col_completado] if col_completado else None
+    with medir("tablero.html", filas=len(df)) as medicion:
+        contenido = html_tablero(df[col_remision], df[col_semaforo], completados)
+        medicion.bytes = len(contenido)
+        st.markdown(contenido, unsafe_allow_html=True)
+
+
+# ==============================
+# --- Tabla con semáforo ---
+# ==============================
+# Las tablas de detalle van directo a st.dataframe (Arrow): el navegador sólo
+# pinta las filas visibles al desplazarse. El semáforo es una columna de
+# estado fija a la izquierda en lugar de colorear cada fila con un Styler.
+AYUDA_SEMAFORO = "🔴 fuera de tiempo · 🟡 por vencer · 🟢 en tiempo · ⚪ sin dato"
+
+
+def mostrar_tabla(df, col_semaforo='Semaforo', column_config=None):
+    """`st.dataframe` con el semáforo como primera columna fija.
+
+    `column_config` agrega o reemplaza la configuración de otras columnas.
+    """
+    config = {col_semaforo: st.column_config.TextColumn("Semáforo", width="small", pinned=True,
+                                                        help=AYUDA_SEMAFORO)}
+    config.update(column_config or {})
+    columnas = [col_semaforo] + [c for c in df.columns if c != col_semaforo]
+    with medir("tabla.dataframe", filas=len(df)):
+        st.dataframe(df, column_order=columnas, column_config=config, hide_index=True, use_container_width=True)
@@ -0,0 +1,94 @@
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from datetime import datetime
+
+import pandas as pd
+import streamlit as st
+
+from comun import pipeline, sheets
+from comun.metricas import medir
+from comun.snapshots import SNAPSHOTS_DIR
+
+# ==============================
+# --- Tendencias en disco ---
+# ==============================
+# Después de cada refresco del sondeo se guardan los conteos por tablero
+# (pipeline.agregados) en una base SQLite local a la que sólo se agregan
+# filas. Sólo se escribe una muestra cuando los conteos cambian: entre dos
+# muestras valen los de la primera. P5 grafica desde aquí sin llamar a la API.
+RUTA_TENDENCIAS = os.path.join(SNAPSHOTS_DIR, "tendencias.sqlite")
+# Las muestras más viejas que esto se borran al escribir
+RETENCION_TENDENCIAS = int(os.environ.get("PANTALLAS_RETENCION_TENDENCIAS", str(30 * 24 * 3600)))
+
+_ESQUEMA = """
+CREATE TABLE IF NOT EXISTS agregados (
+    tomado_en REAL NOT NULL,
+    tablero TEXT NOT NULL,
+    dimension TEXT NOT NULL,
+    valor TEXT NOT NULL,
+    conteo INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS agregados_tablero_tomado_en ON agregados (tablero, dimension, tomado_en);
+"""
+COLUMNAS = ["tomado_en", "tablero", "dimension", "valor", "conteo"]
+
+
+def _conectar(ruta):
+    os.makedirs(os.path.dirname(ruta) or ".", exist_ok=True)
+    conexion = sqlite3.connect(ruta, timeout=10)
+    conexion.executescript(_ESQUEMA)
+    return conexion
+
+
+def agregar_muestra(agregados, tomado_en, ruta=RUTA_TENDENCIAS):
+    """Agrega una muestra (salida de pipeline.agregados) y borra las vencidas."""
+    filas = zip([tomado_en] * len(agregados), agregados["tablero"], agregados["dimension"],
+                agregados["valor"], agregados["conteo"].astype(int).tolist())
+    with closing(_conectar(ruta)) as conexion, conexion:
+        conexion.executemany("INSERT INTO agregados VALUES (?, ?, ?, ?, ?)", filas)
+        conexion.execute("DELETE FROM agregados WHERE tomado_en < ?", (tomado_en - RETENCION_TENDENCIAS,))
+
+
+def leer_tendencias(tablero, dimension, desde, ruta=RUTA_TENDENCIAS):
+    """Muestras de un tablero y dimensión desde `desde` (epoch), hora local."""
+    if not os.path.exists(ruta):
+        return pd.DataFrame(columns=COLUMNAS)
+    with closing(_conectar(ruta)) as conexion:
+        df = pd.read_sql_query(
+            "SELECT * FROM agregados WHERE tablero = ? AND dimension = ? AND tomado_en >= ?"
+            " ORDER BY tomado_en", conexion, params=(tablero, dimension, desde))
+    zona = datetime.now().astimezone().tzinfo
+    df["tomado_en"] = pd.to_datetime(df["tomado_en"], unit="s", utc=True).dt.tz_convert(zona).dt.tz_localize(None)
+    return df
+
+
+# ==============================
+# --- Registro por sondeo ---
+# ==============================
+@st.cache_resource(show_spinner=False)
+def _registro():
+    return {"ultimos": None, "lock": threading.Lock()}
+
+
+def registrar_muestra():
+    """Guarda los conteos vigentes si cambiaron desde la última muestra."""
+    agregados = pipeline.agregados()
+    estado = _registro()
+    with estado["lock"]:
+        ultimos, estado["ultimos"] = estado["ultimos"], agregados
+        if ultimos is agregados or (ultimos is not None and ultimos.equals(agregados)):
+            return
+        with medir("tendencias.muestra") as medicion:
+            agregar_muestra(agregados, time.time())
+            medicion.filas = len(agregados)
+
+
+@st.cache_resource(show_spinner=False)
+def iniciar_registro():
+    """Primera muestra y una después de cada refresco del sondeo (una vez por proceso)."""
+    registrar_muestra()
+    sheets.al_refrescar(registrar_muestra)
+    return True
@@ -0,0 +1,37 @@
+import unittest
+
+from comun.facturacion_expo import preparar_facturacion_expo
+from comun.semaforo import SIN_DATO, VERDE
+
+ENCABEZADOS = ["Pedido", "Factura", "Cliente", "Fecha fact", "Hora factura", "Fecha de SURTIMIENTO"]
+
+
+class PrepararFacturacionExpoTest(unittest.TestCase):
+
+    def _fila(self, fecha_fact, hora, fecha_guia):
+        df = preparar_facturacion_expo([ENCABEZADOS, ["1", "F1", "Cliente", fecha_fact, hora, fecha_guia]])
+        return df.iloc[0]
+
+    def test_horas_entre_guia_y_factura(self):
+        fila = self._fila("05/03/2025", "02:30", "05/03/2025")
+        self.assertEqual(fila['HorasTranscurridas'], 2.5)
+        self.assertEqual(fila['Semaforo'], VERDE)
+
+    def test_fecha_fact_fuera_de_rango_queda_sin_dato(self):
+        fila = self._fila("05/03/3025", "10:00", "05/03/2025")
+        self.assertTrue(fila['HorasTranscurridas'] != fila['HorasTranscurridas'])  # NaN
+        self.assertEqual(fila['Semaforo'], SIN_DATO)
+
+    def test_guia_fuera_de_rango_queda_sin_dato(self):
+        fila = self._fila("05/03/2025", "10:00", "05/03/1025")
+        self.assertTrue(fila['HorasTranscurridas'] != fila['HorasTranscurridas'])
+        self.assertEqual(fila['Semaforo'], SIN_DATO)
+
+    def test_hora_tarde_con_fecha_fuera_de_rango_no_desborda(self):
+        fila = self._fila("05/03/3025", "23:59", "05/03/2025")
+        self.assertTrue(fila['HorasTranscurridas'] != fila['HorasTranscurridas'])
+        self.assertEqual(fila['Semaforo'], SIN_DATO)
+
+
+if __name__ == "__main__":
+    unittest.main()
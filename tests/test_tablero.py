@@ -0,0 +1,52 @@
+import unittest
+
+import numpy as np
+import pandas as pd
+
+from comun.semaforo import AMARILLO, ROJO, VERDE
+from comun.tablero import ROTACION_SEGUNDOS, pagina_vigente, paginas_kiosco
+
+
+class PaginasKioscoTest(unittest.TestCase):
+
+    def _semaforos(self, rojas, otras):
+        return pd.Series([ROJO] * rojas + [AMARILLO, VERDE] * (otras // 2))
+
+    def test_mas_rojas_que_una_pagina_muestra_todas_las_tarjetas(self):
+        semaforos = self._semaforos(rojas=25, otras=30)
+        paginas = paginas_kiosco(semaforos, tarjetas_por_pagina=10)
+        vistas = np.concatenate(paginas)
+        self.assertEqual(sorted(vistas.tolist()), list(range(len(semaforos))))
+        # Primero las rojas
+        self.assertTrue((semaforos.iloc[vistas[:25]] == ROJO).all())
+        self.assertTrue(all(len(p) <= 10 for p in paginas))
+
+    def test_pocas_rojas_quedan_fijas_en_cada_pagina(self):
+        semaforos = self._semaforos(rojas=3, otras=20)
+        paginas = paginas_kiosco(semaforos, tarjetas_por_pagina=10)
+        for pagina in paginas:
+            self.assertEqual(pagina[:3].tolist(), [0, 1, 2])
+        otras = np.concatenate([p[3:] for p in paginas])
+        self.assertEqual(sorted(otras.tolist()), list(range(3, len(semaforos))))
+
+    def test_sin_rojas_una_sola_pagina(self):
+        paginas = paginas_kiosco(self._semaforos(rojas=0, otras=4), tarjetas_por_pagina=10)
+        self.assertEqual(len(paginas), 1)
+
+
+class PaginaVigenteTest(unittest.TestCase):
+
+    def test_cada_pagina_dura_la_rotacion_completa(self):
+        inicio = 1_000 * ROTACION_SEGUNDOS
+        # Reruns a cualquier hora dentro del intervalo no adelantan la página
+        for segundos in (0, 1, ROTACION_SEGUNDOS / 2, ROTACION_SEGUNDOS - 0.01):
+            self.assertEqual(pagina_vigente(4, inicio + segundos), 1_000 % 4)
+        self.assertEqual(pagina_vigente(4, inicio + ROTACION_SEGUNDOS), 1_001 % 4)
+
+    def test_recorre_todas_las_paginas(self):
+        vistas = {pagina_vigente(3, i * ROTACION_SEGUNDOS) for i in range(3)}
+        self.assertEqual(vistas, {0, 1, 2})
+
+
+if __name__ == "__main__":
+    unittest.main()